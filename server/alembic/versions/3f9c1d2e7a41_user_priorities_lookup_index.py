@@ -0,0 +1,33 @@
+"""user priorities lookup index
+
+Revision ID: 3f9c1d2e7a41
+Revises: ac55e523dc50
+Create Date: 2026-10-18 10:12:41.284519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c1d2e7a41"
+down_revision: Union[str, Sequence[str], None] = "ac55e523dc50"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_user_priorities_lookup",
+        "user_priorities",
+        ["user_id", "target_type", "target_id", "priority"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_user_priorities_lookup", table_name="user_priorities")
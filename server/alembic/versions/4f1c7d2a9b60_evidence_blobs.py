@@ -0,0 +1,72 @@
+"""content-addressed evidence blobs
+
+Revision ID: 4f1c7d2a9b60
+Revises: e3b8d51f0a26
+Create Date: 2026-10-18 19:40:27.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f1c7d2a9b60"
+down_revision: Union[str, Sequence[str], None] = "e3b8d51f0a26"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "evidence_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("content_type", sa.String(length=255), nullable=True),
+        sa.Column("storage_path", mysql.MEDIUMTEXT(), nullable=False),
+        sa.Column("id", sa.String(length=40), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "uq_evidence_blobs_sha256", "evidence_blobs", ["sha256"], unique=True
+    )
+    op.create_table(
+        "evidence_references",
+        sa.Column("response_id", sa.String(length=40), nullable=False),
+        sa.Column("blob_id", sa.String(length=40), nullable=False),
+        sa.Column("file_name", sa.String(length=255), nullable=True),
+        sa.Column("id", sa.String(length=40), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["response_id"], ["user_responses.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["blob_id"], ["evidence_blobs.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "uq_evidence_references_response",
+        "evidence_references",
+        ["response_id"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_evidence_references_blob_id", "evidence_references", ["blob_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_evidence_references_blob_id", table_name="evidence_references")
+    op.drop_index("uq_evidence_references_response", table_name="evidence_references")
+    op.drop_table("evidence_references")
+    op.drop_index("uq_evidence_blobs_sha256", table_name="evidence_blobs")
+    op.drop_table("evidence_blobs")
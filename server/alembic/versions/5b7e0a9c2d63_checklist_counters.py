@@ -0,0 +1,51 @@
+"""checklist control/response counters
+
+Revision ID: 5b7e0a9c2d63
+Revises: 8d2b7e4c9f10
+Create Date: 2026-10-18 13:42:05.118273
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e0a9c2d63"
+down_revision: Union[str, Sequence[str], None] = "8d2b7e4c9f10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "checklists",
+        sa.Column("controls_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "checklists",
+        sa.Column("responses_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE checklists SET
+            controls_count = (
+                SELECT COUNT(controls.id) FROM controls
+                WHERE controls.checklist_id = checklists.id
+            ),
+            responses_count = (
+                SELECT COUNT(user_responses.id) FROM user_responses
+                JOIN controls ON user_responses.control_id = controls.id
+                WHERE controls.checklist_id = checklists.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("checklists", "responses_count")
+    op.drop_column("checklists", "controls_count")
@@ -0,0 +1,61 @@
+"""keyset pagination indexes
+
+Revision ID: 8d2b7e4c9f10
+Revises: 3f9c1d2e7a41
+Create Date: 2026-10-18 11:03:17.902166
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2b7e4c9f10"
+down_revision: Union[str, Sequence[str], None] = "3f9c1d2e7a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_applications_active_created",
+        "applications",
+        ["is_active", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_checklists_app_active_created",
+        "checklists",
+        ["app_id", "is_active", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_controls_checklist_created",
+        "controls",
+        ["checklist_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_submissions_created",
+        "submissions",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_submissions_user_created",
+        "submissions",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_submissions_user_created", table_name="submissions")
+    op.drop_index("ix_submissions_created", table_name="submissions")
+    op.drop_index("ix_controls_checklist_created", table_name="controls")
+    op.drop_index("ix_checklists_app_active_created", table_name="checklists")
+    op.drop_index("ix_applications_active_created", table_name="applications")
@@ -0,0 +1,57 @@
+"""one response per user and control
+
+Revision ID: 9c4f2a7b1e85
+Revises: 5b7e0a9c2d63
+Create Date: 2026-10-18 16:20:44.531907
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4f2a7b1e85"
+down_revision: Union[str, Sequence[str], None] = "5b7e0a9c2d63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the most recently updated response where a user answered a
+    # control more than once, then fix the counters it affects.
+    op.execute(
+        """
+        DELETE older FROM user_responses AS older
+        JOIN user_responses AS newer
+            ON newer.control_id = older.control_id
+            AND newer.user_id = older.user_id
+            AND (
+                newer.updated_at > older.updated_at
+                OR (newer.updated_at = older.updated_at AND newer.id > older.id)
+            )
+        """
+    )
+    op.execute(
+        """
+        UPDATE checklists SET
+            responses_count = (
+                SELECT COUNT(user_responses.id) FROM user_responses
+                JOIN controls ON user_responses.control_id = controls.id
+                WHERE controls.checklist_id = checklists.id
+            )
+        """
+    )
+    op.create_index(
+        "uq_user_responses_control_user",
+        "user_responses",
+        ["control_id", "user_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_user_responses_control_user", table_name="user_responses")
@@ -0,0 +1,31 @@
+"""job owners and heartbeats
+
+Revision ID: b7e2c94d1f38
+Revises: 4f1c7d2a9b60
+Create Date: 2026-10-18 21:12:45.301877
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2c94d1f38"
+down_revision: Union[str, Sequence[str], None] = "4f1c7d2a9b60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("jobs", sa.Column("owner", sa.String(length=80), nullable=True))
+    op.add_column("jobs", sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("jobs", "heartbeat_at")
+    op.drop_column("jobs", "owner")
@@ -0,0 +1,53 @@
+"""background import jobs
+
+Revision ID: e3b8d51f0a26
+Revises: 9c4f2a7b1e85
+Create Date: 2026-10-18 18:05:12.640391
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b8d51f0a26"
+down_revision: Union[str, Sequence[str], None] = "9c4f2a7b1e85"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "jobs",
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("user_id", sa.String(length=40), nullable=False),
+        sa.Column("checklist_id", sa.String(length=40), nullable=True),
+        sa.Column("file_name", sa.String(length=255), nullable=True),
+        sa.Column("rows_processed", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rows_failed", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("id", sa.String(length=40), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["checklist_id"], ["checklists.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_jobs_user_created", "jobs", ["user_id", "created_at"])
+    op.create_index("ix_jobs_status", "jobs", ["status"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_jobs_status", table_name="jobs")
+    op.drop_index("ix_jobs_user_created", table_name="jobs")
+    op.drop_table("jobs")
@@ -0,0 +1,113 @@
+"""
+Requests/sec on GET /applications with one engine per worker process
+("shared", the current setup) versus a new engine and pool built for every
+request ("per-request", how get_db_conn() used to work). Run from the server
+directory against the database in DATABASE_URL, which needs an admin user
+and some applications:
+
+    uv run python -m benchmarks.applications_rps [--requests N] [--concurrency N]
+
+Requests go through the ASGI app in process, so the numbers are the API and
+database cost without a network hop or an HTTP server in front.
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Generator
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+import main
+from db.connection import (
+    create_async_db_engine,
+    create_db_engine,
+    create_session_factory,
+    get_async_db_conn,
+    get_db_conn,
+)
+from models import User
+from models.schemas.crud_schemas import UserOut
+from services.auth.deps import get_current_user
+
+
+def per_request_db_conn() -> Generator:
+    SessionLocal = sessionmaker(
+        autoflush=False, autocommit=False, bind=create_db_engine()
+    )
+    db: Session = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def per_request_async_db_conn() -> AsyncGenerator[AsyncSession, None]:
+    AsyncSessionLocal = async_sessionmaker(
+        autoflush=False, autocommit=False, bind=create_async_db_engine()
+    )
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+PER_REQUEST_OVERRIDES = {
+    get_db_conn: per_request_db_conn,
+    get_async_db_conn: per_request_async_db_conn,
+}
+
+
+async def run(mode: str, requests: int, concurrency: int) -> float:
+    overrides = main.app.dependency_overrides
+    for dependency, override in PER_REQUEST_OVERRIDES.items():
+        if mode == "per-request":
+            overrides[dependency] = override
+        else:
+            overrides.pop(dependency, None)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench/api/v1.0"
+    ) as client:
+        remaining = iter(range(requests))
+
+        async def worker():
+            for _ in remaining:
+                response = await client.get(
+                    "/applications", params={"search": "null"}
+                )
+                response.raise_for_status()
+
+        # One warm-up request so both modes start with the app imported
+        await client.get("/applications", params={"search": "null"})
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+async def bench(args: argparse.Namespace):
+    async with main.app.router.lifespan_context(main.app):
+        SessionLocal = create_session_factory()
+        with SessionLocal() as db:
+            admin = db.scalar(select(User).where(User.role == "admin").limit(1))
+            if admin is None:
+                raise SystemExit("DATABASE_URL has no admin user to list as")
+            admin = UserOut.model_validate(admin)
+        main.app.dependency_overrides[get_current_user] = lambda: admin
+
+        for mode in ("per-request", "shared"):
+            rps = await run(mode, args.requests, args.concurrency)
+            print(f"{mode:>12}: {rps:8.1f} requests/sec")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(parse_args()))
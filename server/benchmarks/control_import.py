@@ -0,0 +1,75 @@
+"""
+Time and peak RSS of add_controls_from_file importing a clean control CSV
+of 1k, 10k and 100k rows into an empty checklist on a throwaway SQLite
+database. Run from the server directory:
+
+    uv run python -m benchmarks.control_import [--rows 1000 10000 100000]
+
+Each size runs in a fresh interpreter, so peak RSS is that import's own
+(plus the ~180 MB the app's imports take). Copied onto an older commit,
+the script also times the bytes-based add_controls_from_file from before
+the vectorised import.
+"""
+
+import argparse
+import csv
+import inspect
+import io
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.sqlite_db import create_checklist, use_temp_sqlite
+
+
+def control_csv(rows: int) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["Control Area", "Severity", "Control Text", "Description"])
+    for i in range(rows):
+        writer.writerow(
+            [f"Area {i // 20}", ("Low", "Medium", "High")[i % 3], f"Control {i}", ""]
+        )
+    return buffer.getvalue().encode()
+
+
+def run_one(rows: int) -> None:
+    use_temp_sqlite()
+    from controllers.controls_controller import add_controls_from_file
+    from db.connection import create_session_factory
+
+    checklist_id, _ = create_checklist()
+    content = control_csv(rows)
+    # Before the vectorised import the function took the upload's bytes
+    takes_bytes = "file_content" in inspect.signature(add_controls_from_file).parameters
+    upload = content if takes_bytes else io.BytesIO(content)
+
+    SessionLocal = create_session_factory()
+    with SessionLocal() as db:
+        started = time.perf_counter()
+        add_controls_from_file(upload, "controls.csv", checklist_id, db)
+        elapsed = time.perf_counter() - started
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{rows:>8} rows  {elapsed:7.2f}s  {peak_mb:6.0f} MB peak RSS")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--one", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        run_one(args.rows[0])
+        return
+    for rows in args.rows:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.control_import", "--one", "--rows", str(rows)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
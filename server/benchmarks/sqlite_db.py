@@ -0,0 +1,108 @@
+"""
+A throwaway SQLite database for the benchmarks that measure the app's own
+work rather than MySQL. Call `use_temp_sqlite()` before importing anything
+from the app, since db.config reads DATABASE_URL at import time.
+"""
+
+import os
+import tempfile
+import uuid
+from datetime import datetime, timezone
+
+
+def use_temp_sqlite() -> str:
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    for name, value in {
+        "POOL_SIZE": "5",
+        "MAX_OVERFLOW": "5",
+        "POOL_TIMEOUT": "30",
+        "POOL_RECYCLE": "1800",
+    }.items():
+        os.environ.setdefault(name, value)
+
+    from sqlalchemy.dialects.mysql import MEDIUMTEXT
+    from sqlalchemy.ext.compiler import compiles
+
+    @compiles(MEDIUMTEXT, "sqlite")
+    def _mediumtext_sqlite(type_, compiler, **kw):
+        return "TEXT"
+
+    return path
+
+
+def create_checklist(controls: int = 0, answered: bool = False):
+    """
+    Create the schema, an admin and a checklist with `controls` controls,
+    each with a response when `answered`. Returns (checklist_id, admin).
+    """
+    from sqlalchemy import insert
+
+    from db.base import Base
+    from db.connection import create_session_factory, get_engine
+    from models import Application, Checklist, Control, User, UserResponse
+    from models.schemas.crud_schemas import UserOut
+
+    Base.metadata.create_all(get_engine())
+    SessionLocal = create_session_factory()
+    with SessionLocal() as db:
+        admin = User(
+            username="bench",
+            email="bench@example.com",
+            password_hash="x",
+            first_name="Bench",
+            role="admin",
+        )
+        db.add(admin)
+        db.flush()
+        application = Application(name="bench", creator_id=admin.id, owner_id=admin.id)
+        db.add(application)
+        db.flush()
+        checklist = Checklist(
+            app_id=application.id,
+            checklist_type="bench",
+            creator_id=admin.id,
+            controls_count=controls,
+            responses_count=controls if answered else 0,
+        )
+        db.add(checklist)
+        db.flush()
+
+        now = datetime.now(timezone.utc)
+        control_ids = [str(uuid.uuid4()) for _ in range(controls)]
+        if control_ids:
+            db.execute(
+                insert(Control),
+                [
+                    {
+                        "id": control_id,
+                        "checklist_id": checklist.id,
+                        "control_area": f"Area {i % 50}",
+                        "severity": ("low", "medium", "high")[i % 3],
+                        "control_text": f"Control text {i} " * 4,
+                        "description": f"Description {i}",
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i, control_id in enumerate(control_ids)
+                ],
+            )
+        if answered and control_ids:
+            db.execute(
+                insert(UserResponse),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "control_id": control_id,
+                        "checklist_id": checklist.id,
+                        "user_id": admin.id,
+                        "current_setting": f"Setting {i}",
+                        "review_comment": f"Reviewed {i}",
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i, control_id in enumerate(control_ids)
+                ],
+            )
+        db.commit()
+        return checklist.id, UserOut.model_validate(admin)
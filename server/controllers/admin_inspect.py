@@ -1,7 +1,10 @@
+from fastapi import HTTPException, status
 from models import Application, Submission
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from db.events.status_rollup import recompute_all
+
 
 def get_subs_n_apps(db: Session):
     try:
@@ -13,3 +16,14 @@ def get_subs_n_apps(db: Session):
     except Exception as e:
         print(f"Error fetching submissions and applications: {e}")
         return []
+
+
+def recompute_statuses(db: Session, chunk_size: int = 5000):
+    try:
+        return recompute_all(db, chunk_size=chunk_size)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to recompute statuses: {str(e)}",
+        )
@@ -1,10 +1,12 @@
 from fastapi import HTTPException, status
-from sqlalchemy import select, and_, not_, desc, asc, func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import select, and_, not_, func, or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from models import Application
 from models import ChecklistAssignment
 from models import Checklist
+from models.core.user_priorities import PriorityLoader, join_user_priority
 from models.schemas.crud_schemas import (
     ApplicationCreate,
     ApplicationOut,
@@ -14,9 +16,27 @@ from models.schemas.crud_schemas import (
     ChecklistOut,
 )
 from models.schemas.params import AppQueryParams
+from db.pagination import fetch_page
 from typing import Any
 
 
+def visible_to_user(user_id: str):
+    """
+    Apps a non-admin may list: the ones they own or with a checklist assigned
+    to them. An EXISTS keeps one row per app, so no DISTINCT is needed.
+    """
+    assigned = (
+        select(ChecklistAssignment.id)
+        .join(Checklist, ChecklistAssignment.checklist_id == Checklist.id)
+        .where(
+            Checklist.app_id == Application.id,
+            ChecklistAssignment.user_id == user_id,
+        )
+        .exists()
+    )
+    return or_(Application.owner_id == user_id, assigned)
+
+
 def create_app(
     payload: ApplicationCreate, db: Session, creator: UserOut, owner: UserOut
 ) -> ApplicationOut:
@@ -30,14 +50,13 @@ def create_app(
         db.add(app)
         db.flush()
         app.set_priority_for_user(user_id=creator.id, db=db, priority_val=2)
+        # Defaults are filled in by the flush, so the response is built
+        # before the single commit instead of re-reading the row after it.
+        result = ApplicationOut(**app.to_dict(), priority=2)
         db.commit()
-        db.refresh(app)
-        return ApplicationOut(
-            **app.to_dict(),
-            priority=app.get_priority_for_user(user_id=creator.id, db=db),
-        )
+        return result
 
-    except IntegrityError as e:
+    except IntegrityError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="App with the same exists"
         )
@@ -51,29 +70,19 @@ def create_app(
 
 
 def list_apps(db: Session, user: UserOut, params: AppQueryParams):
-    stmt = select(Application).distinct().where(Application.is_active)
+    stmt = select(Application).where(Application.is_active)
 
     if user.role != "admin":
-        # join checklists and assignments to filter by user_id
-        stmt = (
-            stmt.outerjoin(Application.checklists)
-            .outerjoin(Checklist.assignments)
-            .where(
-                or_(
-                    ChecklistAssignment.user_id == user.id,
-                    Application.owner_id == user.id,
-                )
-            )
-        )
+        stmt = stmt.where(visible_to_user(user.id))
     # else:
     # stmt = stmt.where(Application.creator_id == user.id)
 
-    total_count = db.scalar(select(func.count()).select_from(stmt.subquery()))
-    sort_column = getattr(Application, params.sort_by)
-    if params.sort_order == "desc":
-        sort_column = desc(sort_column)
+    if params.sort_by == "priority":
+        stmt, sort_column = join_user_priority(
+            stmt, "application", Application.id, user.id
+        )
     else:
-        sort_column = asc(sort_column)
+        sort_column = getattr(Application, params.sort_by)
 
     if params.search and params.search != "null" and params.search_by:
         print("FOUND SEARCH Q", params.search)
@@ -84,15 +93,29 @@ def list_apps(db: Session, user: UserOut, params: AppQueryParams):
             stmt = stmt.where(search_column.ilike(search_value))
             print(stmt)
 
-    if params.page >= 1:
-        apps = db.scalars(
-            stmt.order_by(sort_column)
-            .limit(params.page_size)
-            .offset(params.page * params.page_size - params.page_size)
-        ).all()
-    else:
-        print("\nIN ELSE", stmt)
-        apps = db.scalars(stmt.order_by(sort_column)).all()
+    # Checklists, their assignments and the assigned users are rendered for
+    # every app on the page; load them in two batched queries instead of
+    # lazily per app/checklist/assignment.
+    stmt = stmt.options(
+        selectinload(Application.checklists)
+        .selectinload(Checklist.assignments)
+        .joinedload(ChecklistAssignment.user)
+    )
+
+    result = fetch_page(
+        db,
+        stmt,
+        keys=[(sort_column, params.sort_order), (Application.id, params.sort_order)],
+        page=params.page,
+        page_size=params.page_size,
+        cursor=params.cursor,
+        include_total=params.include_total,
+    )
+    apps = [row[0] for row in result.rows]
+
+    priorities = PriorityLoader(db, user.id)
+    priorities.load("application", (app.id for app in apps))
+    priorities.load("checklist", (chk.id for app in apps for chk in app.checklists))
 
     apps_out = []
 
@@ -107,7 +130,7 @@ def list_apps(db: Session, user: UserOut, params: AppQueryParams):
                         UserOut.model_validate(a.user) for a in chk.assignments
                     ],
                     is_completed=chk.is_completed,
-                    priority=chk.get_priority_for_user(user_id=user.id, db=db),
+                    priority=priorities.get("checklist", chk.id),
                     status=chk.status,
                     comment=chk.comment,
                     created_at=chk.created_at,
@@ -127,7 +150,7 @@ def list_apps(db: Session, user: UserOut, params: AppQueryParams):
                         UserOut.model_validate(a.user) for a in chk.assignments
                     ],
                     is_completed=chk.is_completed,
-                    priority=chk.get_priority_for_user(user_id=user.id, db=db),
+                    priority=priorities.get("checklist", chk.id),
                     status=chk.status,
                     comment=chk.comment,
                     created_at=chk.created_at,
@@ -145,43 +168,34 @@ def list_apps(db: Session, user: UserOut, params: AppQueryParams):
                 status=app.status,
                 checklists=app_checklists,
                 ticket_id=app.ticket_id,
-                priority=app.get_priority_for_user(user_id=user.id, db=db),
+                priority=priorities.get("application", app.id),
             )
         )
 
     return {
         "apps": apps_out,
         "assigned_users": [],
-        "total_count": total_count,
+        "total_count": result.total_count,
+        "next_cursor": result.next_cursor,
     }
 
 
 def list_apps_with_details(
     db: Session, user: UserOut, params: AppQueryParams
 ) -> dict[str, Any | list[ApplicationOut]]:
-    stmt = select(Application).distinct().where(Application.is_active)
+    stmt = select(Application).where(Application.is_active)
 
     if user.role != "admin":
-        # join checklists and assignments to filter by user_id
-        stmt = (
-            stmt.outerjoin(Application.checklists)
-            .outerjoin(Checklist.assignments)
-            .where(
-                or_(
-                    ChecklistAssignment.user_id == user.id,
-                    Application.owner_id == user.id,
-                )
-            )
-        )
+        stmt = stmt.where(visible_to_user(user.id))
     # else:
     # stmt = stmt.where(Application.creator_id == user.id)
 
-    total_count = db.scalar(select(func.count()).select_from(stmt.subquery()))
-    sort_column = getattr(Application, params.sort_by)
-    if params.sort_order == "desc":
-        sort_column = desc(sort_column)
+    if params.sort_by == "priority":
+        stmt, sort_column = join_user_priority(
+            stmt, "application", Application.id, user.id
+        )
     else:
-        sort_column = asc(sort_column)
+        sort_column = getattr(Application, params.sort_by)
 
     if params.search and params.search != "null" and params.search_by:
         print("FOUND SEARCH Q", params.search)
@@ -191,27 +205,50 @@ def list_apps_with_details(
         if search_column is not None:
             stmt = stmt.where(search_column.ilike(search_value))
 
-    if params.page >= 1:
-        apps = db.scalars(
-            stmt.order_by(sort_column)
-            .limit(params.page_size)
-            .offset(params.page * params.page_size - params.page_size)
-        ).all()
-    else:
-        apps = db.scalars(stmt.order_by(sort_column)).all()
+    result = fetch_page(
+        db,
+        stmt,
+        keys=[(sort_column, params.sort_order), (Application.id, params.sort_order)],
+        page=params.page,
+        page_size=params.page_size,
+        cursor=params.cursor,
+        include_total=params.include_total,
+    )
+    apps = [row[0] for row in result.rows]
+
+    priorities = PriorityLoader(db, user.id)
+    priorities.load("application", (app.id for app in apps))
 
     return {
         "apps": [
             ApplicationOut(
                 **app.to_dict(),
-                priority=app.get_priority_for_user(user_id=user.id, db=db),
+                priority=priorities.get("application", app.id),
             )
             for app in apps
         ],
-        "total_count": total_count,
+        "total_count": result.total_count,
+        "next_cursor": result.next_cursor,
     }
 
 
+async def list_apps_async(db: AsyncSession, user: UserOut, params: AppQueryParams):
+    """
+    Async variant of `list_apps` for the route layer. The ORM work runs
+    through `AsyncSession.run_sync`, so every query goes over the async
+    driver and the event loop keeps serving other requests meanwhile.
+    """
+    return await db.run_sync(lambda session: list_apps(session, user, params))
+
+
+async def list_apps_with_details_async(
+    db: AsyncSession, user: UserOut, params: AppQueryParams
+) -> dict[str, Any | list[ApplicationOut]]:
+    return await db.run_sync(
+        lambda session: list_apps_with_details(session, user, params)
+    )
+
+
 def update_app(
     payload: ApplicationUpdate, app_id: str, db: Session, current_user: UserOut
 ):
@@ -241,12 +278,9 @@ def update_app(
         app.set_priority_for_user(
             user_id=current_user.id, db=db, priority_val=priority_val
         )
+        result = ApplicationOut(**app.to_dict(), priority=priority_val)
         db.commit()
-        db.refresh(app)
-        return ApplicationOut(
-            **app.to_dict(),
-            priority=app.get_priority_for_user(user_id=current_user.id, db=db),
-        )
+        return result
 
     except HTTPException:
         raise
@@ -337,13 +371,13 @@ def delete_app(app_id: str, db: Session, current_user: UserOut):
                         if control.responses.is_active:
                             control.responses.is_active = False
 
-        db.commit()
-        db.refresh(app)
+        db.flush()
         del_app = ApplicationOut(
             **app.to_dict(),
             priority=app.get_priority_for_user(user_id=current_user.id, db=db),
         ).model_dump()
         del_app["msg"] = "Successfully trashed app"
+        db.commit()
         return del_app
 
     except HTTPException:
@@ -355,50 +389,6 @@ def delete_app(app_id: str, db: Session, current_user: UserOut):
         )
 
 
-def update_app_status(app_id: str, db: Session):
-    try:
-        app = db.get(Application, app_id)
-        if not app:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="App not found"
-            )
-
-        checklists = app.checklists or []
-        if not checklists:
-            app.is_completed = False
-            app.status = "pending"
-            db.commit()
-            db.refresh(app)
-            return {"msg": f"App {app.name} marked pending (no checklists)"}
-
-        completed = [c.is_completed for c in checklists]
-        in_prog = [c.status == "in-progress" for c in checklists]
-
-        if all(completed):
-            app.status = "completed"
-            app.is_completed = True
-        elif any(completed) or any(in_prog):
-            app.status = "in-progress"
-            app.is_completed = False
-        else:
-            app.status = "pending"
-            app.is_completed = False
-
-        db.commit()
-        db.refresh(app)
-
-        return {"msg": f"App {app.name} marked {app.status}"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update application status for {app_id}: {str(e)}",
-        )
-
-
 def restore_app(app_id: str, db: Session):
     try:
         app = db.scalar(
@@ -427,7 +417,6 @@ def restore_app(app_id: str, db: Session):
                             control.responses.is_active = True
 
         db.commit()
-        db.refresh(app)
         return {"msg": "App restored successfully"}
 
     except HTTPException:
@@ -440,7 +429,7 @@ def restore_app(app_id: str, db: Session):
         )
 
 
-def get_trashed_apps(db: Session):
+def get_trashed_apps(db: Session, user: UserOut):
     try:
         trashed_apps = db.scalars(
             select(Application).where(not_(Application.is_active))
@@ -449,10 +438,12 @@ def get_trashed_apps(db: Session):
             raise HTTPException(
                 status_code=status.HTTP_204_NO_CONTENT, detail="No apps in trash"
             )
+        priorities = PriorityLoader(db, user.id)
+        priorities.load("application", (app.id for app in trashed_apps))
         return [
             ApplicationOut(
                 **trashed_app.to_dict(),
-                priority=2,
+                priority=priorities.get("application", trashed_app.id),
             )
             for trashed_app in trashed_apps
         ]
@@ -32,10 +32,9 @@ def assign_users(
             assignment = ChecklistAssignment(checklist_id=checklist_id, user_id=user_id)
             db.add(assignment)
             created_assignments.append(assignment)
-        db.commit()
-        for a in created_assignments:
-            db.refresh(a)
+        db.flush()
         assigned_users = [UserOut.model_validate(a.user) for a in created_assignments]
+        db.commit()
         return AssignmentOut(checklist_id=checklist_id, assigned_users=assigned_users)
     except Exception as e:
         db.rollback()
@@ -1,13 +1,13 @@
 from typing import Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, asc, desc, func, not_, select, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, desc, not_, select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.core.applications import Application
 from models.core.checklist_assignments import ChecklistAssignment
 from models.core.checklists import Checklist
-from models.core.controls import Control
 from models.schemas.crud_schemas import (
     ChecklistCreate,
     ChecklistOut,
@@ -15,10 +15,14 @@ from models.schemas.crud_schemas import (
     UserOut,
 )
 from models.schemas.params import ChecklistQueryParams
-from models.core.user_responses import UserResponse
-from models import UserPriority
+from db.pagination import fetch_page
+from models.core.user_priorities import PriorityLoader, join_user_priority
 
-from .application_controller import update_app_status
+from db.events.status_rollup import (
+    mark_apps_dirty,
+    recount_checklists,
+    rollup_checklists,
+)
 
 
 def create_checklist(
@@ -45,13 +49,11 @@ def create_checklist(
         checklist.set_priority_for_user(
             user_id=creator.id, db=db, priority_val=priority_val
         )
-        db.commit()
-        db.refresh(checklist)
         data = checklist.to_dict()
-        data["app_name"] = checklist.app.name
-        data["priority"] = checklist.get_priority_for_user(user_id=creator.id, db=db)
+        data["app_name"] = app.name
+        data["priority"] = priority_val
+        db.commit()
 
-        update_app_status(app.id, db)
         return ChecklistOut(**data)
 
     except Exception as e:
@@ -75,36 +77,66 @@ def get_checklists_for_app(
                 detail=f"Application not found. {app_id}",
             )
 
-        stmt = (
-            select(Checklist)
-            .distinct()
-            .where(and_(Checklist.app_id == app.id, Checklist.is_active))
+        stmt = select(Checklist).where(
+            and_(Checklist.app_id == app.id, Checklist.is_active)
         )
 
-        total_count = db.scalar(select(func.count()).select_from(stmt.subquery()))
+        if user.role != "admin" and app.owner_id != user.id:
+            # Non-admins: only checklists assigned to them, owner sees all
+            stmt = stmt.where(
+                select(ChecklistAssignment.id)
+                .where(
+                    ChecklistAssignment.checklist_id == Checklist.id,
+                    ChecklistAssignment.user_id == user.id,
+                )
+                .exists()
+            )
+
+        priority_column = None
+        if params.sort_by == "priority" or params.search_by == "priority":
+            stmt, priority_column = join_user_priority(
+                stmt, "checklist", Checklist.id, user.id
+            )
 
-        sort_column = getattr(Checklist, params.sort_by)
-        if params.sort_order == "asc":
-            sort_column = asc(sort_column)
+        if params.sort_by == "priority":
+            sort_column = priority_column
         else:
-            sort_column = desc(sort_column)
+            sort_column = getattr(Checklist, params.sort_by)
+        sort_keys = [
+            (sort_column, params.sort_order),
+            (Checklist.id, params.sort_order),
+        ]
 
         if params.search and params.search != "null" and params.search_by:
-            search_value = f"%{params.search}%"
-            search_column = getattr(Checklist, params.search_by)
-            if search_column is not None:
-                stmt = stmt.where(search_column.ilike(search_value))
+            if params.search_by == "priority":
+                if params.search.strip().isdigit():
+                    stmt = stmt.where(priority_column == int(params.search))
+            else:
+                search_value = f"%{params.search}%"
+                search_column = getattr(Checklist, params.search_by)
+                if search_column is not None:
+                    stmt = stmt.where(search_column.ilike(search_value))
+
+        if user.role == "admin":
+            stmt = stmt.options(
+                selectinload(Checklist.assignments).joinedload(ChecklistAssignment.user)
+            )
+
+        page = fetch_page(
+            db,
+            stmt,
+            keys=sort_keys,
+            page=params.page,
+            page_size=params.page_size,
+            cursor=params.cursor,
+            include_total=params.include_total,
+        )
+        checklists = [row[0] for row in page.rows]
 
         results: list[ChecklistOut] = []
+        priorities = PriorityLoader(db, user.id)
+        priorities.load("checklist", (checklist.id for checklist in checklists))
         if user.role == "admin":
-            if params.page >= 1:
-                checklists = db.scalars(
-                    stmt.order_by(sort_column)
-                    .limit(params.page_size)
-                    .offset(params.page * params.page_size - params.page_size)
-                ).all()
-            else:
-                checklists = db.scalars(stmt.order_by(sort_column)).all()
             print(
                 "Checklist is complete",
                 [checklist.is_completed for checklist in checklists],
@@ -120,9 +152,7 @@ def get_checklists_for_app(
                             for assignment in checklist.assignments
                         ],
                         is_completed=checklist.is_completed,
-                        priority=checklist.get_priority_for_user(
-                            user_id=user.id, db=db
-                        ),
+                        priority=priorities.get("checklist", checklist.id),
                         created_at=checklist.created_at,
                         updated_at=checklist.updated_at,
                         status=checklist.status,
@@ -130,24 +160,6 @@ def get_checklists_for_app(
                 )
 
         else:
-            # Non-admins: only checklists assigned to them
-
-            stmt = stmt.outerjoin(ChecklistAssignment).where(
-                or_(
-                    ChecklistAssignment.user_id == user.id,  # assigned to user
-                    Application.owner_id == user.id,  # owner sees all
-                )
-            )
-
-            if params.page >= 1:
-                checklists = db.scalars(
-                    stmt.order_by(sort_column)
-                    .limit(params.page_size)
-                    .offset(params.page * params.page_size - params.page_size)
-                ).all()
-            else:
-                checklists = db.scalars(stmt.order_by(sort_column)).all()
-
             for checklist in checklists:
                 results.append(
                     ChecklistOut(
@@ -157,16 +169,20 @@ def get_checklists_for_app(
                         is_completed=checklist.is_completed,
                         created_at=checklist.created_at,
                         updated_at=checklist.updated_at,
-                        priority=checklist.get_priority_for_user(
-                            user_id=user.id, db=db
-                        ),
+                        priority=priorities.get("checklist", checklist.id),
                         status=checklist.status,
                         comment=checklist.comment,
                     )
                 )
 
-        return {"checklists": results, "total_count": total_count}
+        return {
+            "checklists": results,
+            "total_count": page.total_count,
+            "next_cursor": page.next_cursor,
+        }
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error while getting the checklists for app: {str(e)}")
         raise HTTPException(
@@ -175,6 +191,14 @@ def get_checklists_for_app(
         )
 
 
+async def get_checklists_for_app_async(
+    app_id: str, db: AsyncSession, user: UserOut, params: ChecklistQueryParams
+) -> dict[str, list[ChecklistOut] | Any]:
+    return await db.run_sync(
+        lambda session: get_checklists_for_app(app_id, session, user, params)
+    )
+
+
 def get_checklists_for_user(user: UserOut, db: Session) -> list[ChecklistOut]:
     try:
         checklists = db.scalars(
@@ -186,10 +210,12 @@ def get_checklists_for_user(user: UserOut, db: Session) -> list[ChecklistOut]:
             "Checklist is complete",
             [checklist.is_completed for checklist in checklists],
         )
+        priorities = PriorityLoader(db, user.id)
+        priorities.load("checklist", (checklist.id for checklist in checklists))
         return [
             ChecklistOut(
                 **checklist.to_dict(),
-                priority=checklist.get_priority_for_user(user_id=user.id, db=db),
+                priority=priorities.get("checklist", checklist.id),
             )
             for checklist in checklists
         ]
@@ -222,18 +248,18 @@ def update_checklist(
             user_id=current_user.id, db=db, priority_val=priority_val
         )
 
-        db.commit()
-        db.refresh(checklist)
-        return ChecklistOut(
+        result = ChecklistOut(
             id=checklist.id,
             app_name=checklist.app.name,
             checklist_type=checklist.checklist_type,
             is_completed=checklist.is_completed,
             created_at=checklist.created_at,
             updated_at=checklist.updated_at,
-            priority=checklist.get_priority_for_user(user_id=current_user.id, db=db),
+            priority=priority_val,
             status=checklist.status,
         )
+        db.commit()
+        return result
     except HTTPException:
         raise
     except Exception as e:
@@ -294,57 +320,24 @@ def update_checklist_status(
         checklist.status = checklist_status
         checklist.is_completed = checklist_status in {"approved", "rejected"}
         checklist.comment = comment
+        db.flush()
 
-        db.commit()
-        db.refresh(checklist)
-        update_app_status(checklist.app_id, db)
-
-        return {
+        result = {
             "msg": f"Checklist '{checklist.checklist_type}' marked as {checklist.status}",
             "status": checklist.status,
             "is_completed": checklist.is_completed,
             "checklist": ChecklistOut.model_validate(checklist),
             "Recieved status": checklist_status,
         }
+        db.commit()
+        return result
 
     # --- Automatic update case ---
-
-    control_count = (
-        db.scalar(
-            select(func.count())
-            .select_from(Control)
-            .where(Control.checklist_id == checklist_id)
-        )
-        or 0
-    )
-
-    if control_count == 0:
-        checklist.status = "pending"
-        checklist.is_completed = False
-
-    else:
-        responses_count = (
-            db.scalar(
-                select(func.count(UserResponse.id))
-                .join(Control, UserResponse.control_id == Control.id)
-                .where(Control.checklist_id == checklist_id)
-            )
-            or 0
-        )
-
-        if responses_count == 0:
-            checklist.status = "pending"
-            checklist.is_completed = False
-        elif responses_count < control_count:
-            checklist.status = "in-progress"
-            checklist.is_completed = False
-        else:
-            checklist.status = "completed"
-            checklist.is_completed = True
-
+    # Recomputed from the checklist's counters, replacing an evaluation;
+    # the application follows in the status rollup at commit
+    mark_apps_dirty(db, rollup_checklists(db, [checklist.id], keep_evaluated=False))
     db.commit()
     db.refresh(checklist)
-    update_app_status(checklist.app_id, db)
 
     return {
         "msg": f"Checklist '{checklist.checklist_type}' marked as {checklist.status}",
@@ -354,6 +347,18 @@ def update_checklist_status(
     }
 
 
+def repair_checklist_counts(db: Session) -> int:
+    """
+    Recompute `controls_count`/`responses_count` from the controls and
+    user_responses tables and fix the checklists that drifted. Their
+    statuses are rolled up from the corrected counters on commit.
+    Returns the number of checklists corrected.
+    """
+    repaired = recount_checklists(db)
+    db.commit()
+    return repaired
+
+
 def remove_checklist(
     checklist_id: str,
     db: Session,
@@ -398,9 +403,9 @@ def remove_checklist(
                 if control.responses.is_active:
                     setattr(control.responses, "is_active", False)
 
+        checklist_type = checklist.checklist_type
         db.commit()
-        db.refresh(checklist)
-        return {"msg": f"Checklist Deleted successfully {checklist.checklist_type}"}
+        return {"msg": f"Checklist Deleted successfully {checklist_type}"}
 
     except HTTPException:
         raise
@@ -460,6 +465,9 @@ def get_trash_checklists(
             select(Checklist)
             .where(and_(Checklist.app_id == app.id, not_(Checklist.is_active)))
             .order_by(desc(Checklist.updated_at))
+            .options(
+                selectinload(Checklist.assignments).joinedload(ChecklistAssignment.user)
+            )
         ).all()
         print(
             "Checklist is complete",
@@ -1,9 +1,19 @@
+import uuid
+from datetime import datetime, timezone
+from typing import BinaryIO, Callable
+
 from fastapi import HTTPException, status
-from sqlalchemy import and_, func, select, desc, asc
+from sqlalchemy import and_, func, insert, select, desc
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+import csv
 import pandas as pd
-from io import BytesIO, StringIO
+from io import StringIO
+from tempfile import SpooledTemporaryFile
 from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
 
 from models.core.checklist_assignments import ChecklistAssignment
 from models.core.checklists import Checklist
@@ -20,7 +30,35 @@ from models.schemas.crud_schemas import (
 )
 from models.core.user_responses import UserResponse
 from models.schemas.params import ControlsResponsesQueryParams
-from .checklist_controller import update_checklist_status
+from db.connection import create_session_factory
+from db.pagination import fetch_page
+from db.events.status_rollup import adjust_counts
+from services.imports.sheet_reader import iter_sheet_chunks
+
+# Columns of the controls-with-responses export, in file order
+EXPORT_COLUMNS = {
+    "response_id": UserResponse.id,
+    "control_id": Control.id,
+    "control_area": Control.control_area,
+    "severity": Control.severity,
+    "control_text": Control.control_text,
+    "description": Control.description,
+    "current_setting": UserResponse.current_setting,
+    "review_comment": UserResponse.review_comment,
+    "evidence_path": UserResponse.evidence_path,
+}
+EXPORT_BATCH_SIZE = 1000
+
+CONTROL_IMPORT_COLUMNS = ["control_area", "severity", "control_text", "description"]
+VALID_SEVERITIES = ["low", "medium", "high", "critical"]
+CONTROL_AREA_MAX_LENGTH = Control.__table__.c.control_area.type.length
+CONTROL_INSERT_CHUNK_SIZE = 1000
+# Rejected rows listed in the import response; "failed" has the full count
+IMPORT_ERROR_REPORT_LIMIT = 1000
+# Workbooks up to this size are assembled in memory, larger ones on disk
+XLSX_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+XLSX_READ_SIZE = 64 * 1024
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 
 def update_checklist_completion_for_user(checklist_id: str, user: UserOut, db: Session):
@@ -86,11 +124,12 @@ def add_controls(control: ControlCreate, checklist_id: str, db: Session) -> Cont
         )
 
         db.add(new_control)
+        adjust_counts(db, checklist.id, controls=1)
+        db.flush()
+        result = ControlOut.model_validate(new_control)
         db.commit()
-        db.refresh(new_control)
-        update_checklist_status(checklist_id=checklist_id, db=db)
 
-        return ControlOut.model_validate(new_control)
+        return result
 
     except Exception as e:
         db.rollback()
@@ -111,11 +150,15 @@ def remove_controls(control_data: ControlRemove, db: Session):
                 detail=f"Checklist Not found {control_data.control_id}",
             )
 
+        checklist_id = control.checklist_id
+        responses_count = db.scalar(
+            select(func.count(UserResponse.id)).where(
+                UserResponse.control_id == control.id
+            )
+        )
         db.delete(control)
+        adjust_counts(db, checklist_id, controls=-1, responses=-responses_count)
         db.commit()
-        db.refresh(control)
-        checklist_id = control.checklist_id
-        update_checklist_status(checklist_id=checklist_id, db=db)
 
     except Exception as e:
         db.rollback()
@@ -205,122 +248,71 @@ def get_controls_with_responses(
     params: ControlsResponsesQueryParams,
 ) -> ControlWithResponseOut | list:
     try:
-        sort_order = params.sort_order
-        filter_table = "controls"
-        if filter_table == "controls":
-            sort_column = getattr(Control, "created_at")
-        elif filter_table == "responses":
-            sort_column = getattr(UserResponse, "created_at")
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid filter table param {filter_table}",
-            )
-
-        if sort_order == "asc":
-            sort_column_by = asc(sort_column)
-        else:
-            sort_column_by = desc(sort_column)
         if current_user.role == "admin":
             # Validate checklist exists
             checklist = db.scalar(select(Checklist).where(Checklist.id == checklist_id))
             if not checklist:
                 return []
-
-            if params.page >= 1:
-                stmt = (
-                    select(Control, UserResponse)
-                    .outerjoin(
-                        UserResponse, and_(UserResponse.control_id == Control.id)
-                    )
-                    .where(Control.checklist_id == checklist_id)
-                    .order_by(sort_column_by, asc(Control.control_area))
-                    .limit(params.page_size)
-                    .offset(params.page * params.page_size - params.page_size)
-                )
-            else:
-                stmt = (
-                    select(Control, UserResponse)
-                    .outerjoin(
-                        UserResponse, and_(UserResponse.control_id == Control.id)
-                    )
-                    .where(Control.checklist_id == checklist_id)
-                    .order_by(sort_column_by)
-                )
-
-            results = db.execute(stmt).all()
-            total_controls = db.scalar(
-                select(func.count(Control.id)).where(
-                    Control.checklist_id == checklist_id
-                )
-            )
-
-            total_responses = db.scalar(
-                select(func.count(UserResponse.id)).where(
-                    UserResponse.checklist_id == checklist_id
-                )
-            )
-
-            total_counts = TotalsCount(
-                total_responses=total_responses,
-                total_controls=total_controls,
-            )
-
-            # Validate with Pydantic
-            controls_with_responses_non = [
-                ControlWithResponseOutNonList(
-                    checklist_id=checklist_id,
-                    response_id=response.id if response else None,
-                    control_id=control.id,
-                    control_area=control.control_area,
-                    severity=control.severity,
-                    control_text=control.control_text,
-                    description=control.description,
-                    current_setting=response.current_setting if response else None,
-                    review_comment=response.review_comment if response else None,
-                    evidence_path=response.evidence_path if response else None,
-                    response_created_at=response.created_at if response else None,
-                    response_updated_at=response.updated_at if response else None,
-                    control_created_at=control.created_at if control else None,
-                    control_updated_at=control.updated_at if control else None,
+        else:
+            # Check assignment
+            stmt = select(ChecklistAssignment.user_id).where(
+                and_(
+                    ChecklistAssignment.checklist_id == checklist_id,
+                    ChecklistAssignment.user_id == current_user.id,
                 )
-                for control, response in results
-            ]
-
-            controls_with_responses = ControlWithResponseOut(
-                list_controls=controls_with_responses_non,
-                total_counts=total_counts,
-            )
-
-            return controls_with_responses
-
-        # Check assignment
-        stmt = select(ChecklistAssignment.user_id).where(
-            and_(
-                ChecklistAssignment.checklist_id == checklist_id,
-                ChecklistAssignment.user_id == current_user.id,
             )
-        )
-        user_assigned = db.scalar(stmt)
-        if not user_assigned:
-            return []
+            user_assigned = db.scalar(stmt)
+            if not user_assigned:
+                return []
 
-        # Join controls with responses for this user
+        # Join controls with responses
         stmt = (
             select(Control, UserResponse)
-            .outerjoin(
-                UserResponse,
-                and_(
-                    UserResponse.control_id == Control.id,
-                ),
-            )
+            .outerjoin(UserResponse, and_(UserResponse.control_id == Control.id))
             .where(Control.checklist_id == checklist_id)
         )
 
-        results = db.execute(stmt).all()
-
-        total_controls = len(results)
-        total_responses = sum(1 for _, response in results if response is not None)
+        next_cursor = None
+        # Admins page through the checklist, other users get every control
+        # unless they opt into cursor paging.
+        if current_user.role == "admin" or params.cursor is not None:
+            page = fetch_page(
+                db,
+                stmt,
+                keys=[
+                    (Control.created_at, params.sort_order),
+                    (Control.control_area, "asc"),
+                    (Control.id, "asc"),
+                    # A control has a row per response; an unanswered one
+                    # has a single row with no response id
+                    (func.coalesce(UserResponse.id, ""), "asc"),
+                ],
+                page=params.page,
+                page_size=params.page_size,
+                cursor=params.cursor,
+                include_total=False,
+            )
+            results, next_cursor = page.rows, page.next_cursor
+
+            total_controls = total_responses = None
+            if params.include_total:
+                # Both totals in one round trip
+                total_controls, total_responses = db.execute(
+                    select(
+                        select(func.count(Control.id))
+                        .where(Control.checklist_id == checklist_id)
+                        .scalar_subquery(),
+                        select(func.count(UserResponse.id))
+                        .where(UserResponse.checklist_id == checklist_id)
+                        .scalar_subquery(),
+                    )
+                ).one()
+        else:
+            results = db.execute(stmt).all()
+            total_controls = len(results)
+            total_responses = sum(
+                1 for _, response, *_ in results if response is not None
+            )
 
         total_counts = TotalsCount(
             total_responses=total_responses,
@@ -345,16 +337,19 @@ def get_controls_with_responses(
                 control_created_at=control.created_at if control else None,
                 control_updated_at=control.updated_at if control else None,
             )
-            for control, response in results
+            for control, response, *_ in results
         ]
 
         controls_with_responses = ControlWithResponseOut(
             list_controls=controls_with_responses_non,
             total_counts=total_counts,
+            next_cursor=next_cursor,
         )
 
         return controls_with_responses
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -362,17 +357,32 @@ def get_controls_with_responses(
         )
 
 
+async def get_controls_with_responses_async(
+    checklist_id: str,
+    db: AsyncSession,
+    current_user: UserOut,
+    params: ControlsResponsesQueryParams,
+) -> ControlWithResponseOut | list:
+    return await db.run_sync(
+        lambda session: get_controls_with_responses(
+            checklist_id=checklist_id,
+            db=session,
+            current_user=current_user,
+            params=params,
+        )
+    )
+
+
 def update_control(payload: ControlUpdate, control_id: str, db: Session):
     try:
         control = get_control(control_id=control_id, db=db)
         for key, val in payload.model_dump(exclude_unset=True).items():
             setattr(control, key, val)
 
-        db.commit()
-        db.refresh(control)
-
+        db.flush()
         updated_result = ControlOut.model_validate(control).model_dump()
         updated_result["msg"] = "Control Updated successfully"
+        db.commit()
         return updated_result
 
     except HTTPException:
@@ -420,8 +430,8 @@ def import_controls(target_checklist_id: str, source_checklist_id: str, db: Sess
             for control in source_checklist.controls
         ]
         db.add_all(new_controls)
+        adjust_counts(db, target_checklist.id, controls=len(new_controls))
         db.commit()
-        update_checklist_status(checklist_id=target_checklist_id, db=db)
 
         return {"msg": f"Succesfully added {len(new_controls)} Controls."}
 
@@ -435,104 +445,236 @@ def import_controls(target_checklist_id: str, source_checklist_id: str, db: Sess
         )
 
 
-def add_controls_from_file(
-    file_content: bytes, file_name: str, checklist_id: str, db: Session
+def _prepare_controls(
+    df: pd.DataFrame, checklist_id: str, now: datetime, last_area: str | None = None
 ):
-    df = (
-        pd.read_csv(BytesIO(file_content))
-        if file_name.endswith(".csv")
-        else pd.read_excel(BytesIO(file_content))
-    )
-    df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
-
-    required_columns = ["control_area", "severity", "control_text", "description"]
-    missing_cols = [col for col in required_columns if col not in df.columns]
-    if missing_cols:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Missing required columns: {', '.join(missing_cols)}",
-        )
-    valid_severities = ["low", "medium", "high", "critical"]
-    invalid_severities = (
-        df.loc[~df["severity"].str.lower().isin(valid_severities), "severity"]
-        .dropna()
-        .unique()
-    )
-    if len(invalid_severities) > 0:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid severity values: {', '.join(invalid_severities)}. "
-            f"Must be one of: {', '.join(valid_severities)}",
-        )
-
+    """
+    Validate and normalise a chunk of an uploaded control sheet column by
+    column. `df` is indexed by sheet row number and `last_area` is the
+    area the previous chunk ended with. Returns the insert parameters for
+    the valid rows, a {"row", "error"} entry per rejected row and the area
+    this chunk ends with.
+    """
+    df = df.reindex(columns=CONTROL_IMPORT_COLUMNS)
+    sheet_rows = df.index.to_series()
+
+    text = {
+        column: df[column].astype("string").str.strip().replace("", pd.NA)
+        for column in CONTROL_IMPORT_COLUMNS
+    }
+    # Blank areas continue the area of the rows above (grouped sheets)
+    text["control_area"] = text["control_area"].ffill()
+    if last_area is not None:
+        text["control_area"] = text["control_area"].fillna(last_area)
+    if not text["control_area"].empty and pd.notna(text["control_area"].iloc[-1]):
+        last_area = text["control_area"].iloc[-1]
+    text["severity"] = text["severity"].str.lower()
+
+    problems = [
+        (text["control_area"].isna(), "Control area cannot be empty"),
+        (text["control_text"].isna(), "Control text cannot be empty"),
+        (
+            text["control_area"].str.len().gt(CONTROL_AREA_MAX_LENGTH).fillna(False),
+            f"Control area is longer than {CONTROL_AREA_MAX_LENGTH} characters",
+        ),
+        (
+            ~text["severity"].isin(VALID_SEVERITIES).fillna(False),
+            f"Severity must be one of: {', '.join(VALID_SEVERITIES)}",
+        ),
+    ]
+    invalid = pd.Series(False, index=df.index)
     errors = []
-    new_controls = []
-    df["control_area"] = df["control_area"].ffill()
-
-    for index, row in df.iterrows():
-        control_data = {
+    for mask, message in problems:
+        mask = mask.astype(bool) & ~invalid
+        errors.extend({"row": int(row), "error": message} for row in sheet_rows[mask])
+        invalid |= mask
+    errors.sort(key=lambda error: error["row"])
+
+    valid = pd.DataFrame(
+        {column: values[~invalid] for column, values in text.items()}
+    ).astype(object)
+    valid = valid.where(valid.notna(), None)
+    records = [
+        {
+            "id": str(uuid.uuid4()),
             "checklist_id": checklist_id,
-            "control_area": str(row["control_area"]).strip(),
-            "severity": str(row["severity"]).strip(),
-            "control_text": str(row["control_text"]).strip(),
-            "description": str(row.get("description", "")).strip()
-            if pd.notna(row.get("description"))
-            else None,
+            "created_at": now,
+            "updated_at": now,
+            "is_active": True,
+            **row,
         }
+        for row in valid.to_dict("records")
+    ]
+    return records, errors, last_area
+
 
-        if not control_data["control_area"] or not control_data["control_text"]:
-            errors.append(f"Row {index}: Control area and control text cannot be empty")
-            continue
+def _insert_controls(db: Session, records: list[dict]) -> None:
+    # render_nulls keeps rows with and without a description in the same
+    # executemany batch instead of splitting on every change
+    stmt = insert(Control).execution_options(render_nulls=True)
+    for start in range(0, len(records), CONTROL_INSERT_CHUNK_SIZE):
+        db.execute(stmt, records[start : start + CONTROL_INSERT_CHUNK_SIZE])
 
-        new_controls.append(Control(**control_data))
 
+def add_controls_from_file(
+    file: BinaryIO,
+    file_name: str,
+    checklist_id: str,
+    db: Session,
+    progress: Callable[[int, int], None] | None = None,
+):
+    """
+    Import a control sheet chunk by chunk straight from the upload file,
+    inserting each chunk as it is parsed. The whole file is one
+    transaction, so a failure leaves the checklist untouched. `progress`
+    is called after every chunk with the rows processed and failed so far.
+    """
+    now = datetime.now(timezone.utc)
+    inserted, failed, errors = 0, 0, []
+    last_area = None
     try:
-        db.add_all(new_controls)
+        for chunk in iter_sheet_chunks(file, file_name):
+            missing_cols = [
+                col for col in CONTROL_IMPORT_COLUMNS if col not in chunk.columns
+            ]
+            if missing_cols:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Missing required columns: {', '.join(missing_cols)}",
+                )
+
+            records, chunk_errors, last_area = _prepare_controls(
+                chunk, checklist_id, now, last_area
+            )
+            _insert_controls(db, records)
+            inserted += len(records)
+            failed += len(chunk_errors)
+            errors.extend(chunk_errors[: IMPORT_ERROR_REPORT_LIMIT - len(errors)])
+            if progress:
+                progress(inserted + failed, failed)
+
+        # One counter update, so the status rollup runs once at commit
+        adjust_counts(db, checklist_id, controls=inserted)
         db.commit()
-        update_checklist_status(checklist_id=checklist_id, db=db)
 
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error adding data from file: {str(e)}",
         )
 
-    return {"msg": f"Added {df.shape[0]} row to the checklist"}
+    return {
+        "msg": f"Added {inserted} row to the checklist",
+        "inserted": inserted,
+        "failed": failed,
+        "errors": errors,
+    }
 
 
-def export_controls_csv(checklist_id: str, db: Session, current_user: UserOut):
+def check_export_access(checklist_id: str, db: Session, current_user: UserOut):
+    """Return the checklist if it exists, has controls and the user may export it."""
     checklist = db.get(Checklist, checklist_id)
     if not checklist:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Checklist Not found {checklist_id}",
         )
-    params = ControlsResponsesQueryParams(
-        sort_by="created_at", sort_order="desc", page=-1, page_size=100
-    )
-    data = get_controls_with_responses(
-        checklist_id=checklist_id, db=db, current_user=current_user, params=params
-    )
-    if not data or not data.list_controls:  # type: ignore
+    if current_user.role != "admin" and not db.scalar(
+        select(ChecklistAssignment.user_id).where(
+            ChecklistAssignment.checklist_id == checklist_id,
+            ChecklistAssignment.user_id == current_user.id,
+        )
+    ):
         raise HTTPException(status_code=404, detail="No controls found")
+    if not db.scalar(
+        select(Control.id).where(Control.checklist_id == checklist_id).limit(1)
+    ):
+        raise HTTPException(status_code=404, detail="No controls found")
+    return checklist
 
-    EXCLUDE_COLUMNS = [
-        "checklist_id",
-        "response_created_at",
-        "response_updated_at",
-        "control_created_at",
-        "control_updated_at",
-    ]
 
-    records = [c.model_dump() for c in data.list_controls]
+def iter_export_rows(checklist_id: str, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Yield lists of export rows, `batch_size` at a time, straight off a
+    server-side cursor. Runs on its own session because the response body
+    is produced after the request's session has been handed back.
+    """
+    stmt = (
+        select(*EXPORT_COLUMNS.values())
+        .outerjoin(UserResponse, UserResponse.control_id == Control.id)
+        .where(Control.checklist_id == checklist_id)
+        .order_by(desc(Control.created_at), Control.control_area, Control.id)
+        .execution_options(yield_per=batch_size)
+    )
+    SessionLocal = create_session_factory()
+    with SessionLocal() as db:
+        for rows in db.execute(stmt).partitions():
+            yield rows
+
+
+def stream_controls_csv(checklist_id: str):
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    # Header goes out before the first query runs
+    yield buffer.getvalue()
+    for rows in iter_export_rows(checklist_id):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+def _xlsx_value(sheet, value):
+    if not isinstance(value, str):
+        return value
+    value = ILLEGAL_CHARACTERS_RE.sub("", value)
+    if not value.startswith("="):
+        return value
+    # Never let a response like "=HYPERLINK(...)" become a formula
+    cell = WriteOnlyCell(sheet, value)
+    cell.data_type = "s"
+    return cell
+
+
+def stream_controls_xlsx(checklist_id: str):
+    """
+    Fill a write-only workbook row by row from the streaming query, save it
+    to a spooled temp file and stream that back in fixed-size reads.
+    """
+    with SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_SIZE) as spool:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Controls")
+        sheet.append(list(EXPORT_COLUMNS))
+        for rows in iter_export_rows(checklist_id):
+            for row in rows:
+                sheet.append([_xlsx_value(sheet, value) for value in row])
+        workbook.save(spool)
+
+        spool.seek(0)
+        while chunk := spool.read(XLSX_READ_SIZE):
+            yield chunk
+
+
+def export_controls_xlsx(checklist_id: str, db: Session, current_user: UserOut):
+    checklist = check_export_access(checklist_id, db, current_user)
+    return StreamingResponse(
+        stream_controls_xlsx(checklist_id),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f"attachment; filename={checklist.checklist_type}_controls.xlsx"
+        },
+    )
+
 
-    df = pd.DataFrame(records)
-    df = df.drop(columns=[col for col in EXCLUDE_COLUMNS if col in df.columns])
-    output = StringIO()
-    df.to_csv(output, index=False)
-    output.seek(0)
+def export_controls_csv(checklist_id: str, db: Session, current_user: UserOut):
+    checklist = check_export_access(checklist_id, db, current_user)
     return StreamingResponse(
-        iter([output.getvalue()]),
+        stream_controls_csv(checklist_id),
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename={checklist.checklist_type}_controls.csv"
@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from db.connection import create_session_factory
+from models.core.evidence_blobs import EvidenceBlob, EvidenceReference
+from models.core.user_responses import UserResponse
+from services.extensions.metrics import EVIDENCE_UPLOADS
+from services.previews.worker import preview_path, schedule_preview
+from services.storage.backends import get_storage, storage_for_path
+from services.storage.base import guess_content_type
+
+logger = logging.getLogger("evidence")
+
+HASH_CHUNK_SIZE = 1024 * 1024
+BLOB_KEY_RE = re.compile(r"evidence/sha256/[0-9a-f]{2}/([0-9a-f]{64})$")
+
+
+def blob_key(sha256: str) -> str:
+    return f"evidence/sha256/{sha256[:2]}/{sha256}"
+
+
+def blob_sha256(evidence_path: str | None) -> str | None:
+    """The hash of a content-addressed evidence path, None for any other path."""
+    match = BLOB_KEY_RE.search(evidence_path or "")
+    return match.group(1) if match else None
+
+
+def hash_file(file: BinaryIO) -> tuple[str, int]:
+    """SHA-256 and size of a file, read in chunks; leaves it rewound."""
+    digest, size = hashlib.sha256(), 0
+    file.seek(0)
+    while chunk := file.read(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    file.seek(0)
+    return digest.hexdigest(), size
+
+
+def store_evidence_blob(file: BinaryIO, file_name: str) -> str:
+    """
+    Store an evidence file once per distinct content and return its path.
+    When a blob with the same hash exists nothing is uploaded. Blocks, so
+    call it from the threadpool.
+    """
+    sha256, size = hash_file(file)
+    SessionLocal = create_session_factory()
+    with SessionLocal() as db:
+        storage_path = db.scalar(
+            select(EvidenceBlob.storage_path).where(EvidenceBlob.sha256 == sha256)
+        )
+        if storage_path:
+            EVIDENCE_UPLOADS.labels("deduplicated").inc()
+            return storage_path
+
+        content_type = guess_content_type(file_name)
+        storage_path = get_storage().save(file, blob_key(sha256), content_type)
+        # Only recorded once the object exists, so a blob row can be trusted
+        db.add(
+            EvidenceBlob(
+                sha256=sha256,
+                size=size,
+                content_type=content_type,
+                storage_path=storage_path,
+            )
+        )
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent upload of the same content won; same key, same bytes
+            db.rollback()
+            storage_path = db.scalar(
+                select(EvidenceBlob.storage_path).where(EvidenceBlob.sha256 == sha256)
+            )
+        else:
+            # Once per blob; later uploads of the same image share the preview
+            schedule_preview(file, size, content_type, storage_path)
+        EVIDENCE_UPLOADS.labels("stored").inc()
+        return storage_path
+
+
+def link_evidence(db: Session, response: UserResponse, file_name: str | None = None):
+    """Point the response's blob reference at whatever its evidence_path is now."""
+    sha256 = blob_sha256(response.evidence_path)
+    blob_id = sha256 and db.scalar(
+        select(EvidenceBlob.id).where(EvidenceBlob.sha256 == sha256)
+    )
+    reference = response.evidence_reference
+    if not blob_id:
+        if reference is not None:
+            response.evidence_reference = None
+        return
+
+    if reference is None:
+        response.evidence_reference = EvidenceReference(
+            blob_id=blob_id, file_name=file_name
+        )
+    else:
+        reference.blob_id = blob_id
+        if file_name:
+            reference.file_name = file_name
+
+
+def delete_evidence_file(evidence_path: str) -> None:
+    """
+    Delete a response's own evidence file once the response no longer
+    points at it. Blobs may be shared, so they are left for
+    `prune_evidence_blobs` once nothing references them. Blocks.
+    """
+    if blob_sha256(evidence_path):
+        return
+    try:
+        storage_for_path(evidence_path).delete(evidence_path)
+    except Exception:
+        # The response is already saved; an orphaned file is only wasted space
+        logger.exception("Could not delete evidence file %s", evidence_path)
+
+
+def prune_evidence_blobs(db: Session, min_age: timedelta = timedelta(days=1)) -> int:
+    """
+    Delete blobs no response references. Only blobs older than `min_age`
+    go, so one just stored for a response being saved is never removed.
+    """
+    cutoff = datetime.now(timezone.utc) - min_age
+    unreferenced = ~(
+        select(EvidenceReference.id)
+        .where(EvidenceReference.blob_id == EvidenceBlob.id)
+        .exists()
+    )
+    blobs = db.execute(
+        select(EvidenceBlob.id, EvidenceBlob.storage_path).where(
+            EvidenceBlob.created_at < cutoff, unreferenced
+        )
+    ).all()
+
+    pruned = 0
+    for blob_id, storage_path in blobs:
+        # The row goes first, and only if still unreferenced: a new upload
+        # of the same content then stores the object again
+        deleted = db.execute(
+            delete(EvidenceBlob).where(EvidenceBlob.id == blob_id, unreferenced)
+        ).rowcount
+        db.commit()
+        if not deleted:
+            continue
+        try:
+            storage = storage_for_path(storage_path)
+            storage.delete(storage_path)
+            storage.delete(preview_path(storage_path))
+        except Exception:
+            logger.exception("Could not delete evidence blob %s", storage_path)
+        pruned += 1
+    return pruned
@@ -0,0 +1,210 @@
+import os
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from botocore.exceptions import BotoCoreError, ClientError
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from controllers.application_controller import visible_to_user
+from controllers.controls_controller import stream_controls_csv, stream_controls_xlsx
+from controllers.evidence_controller import blob_sha256
+from db.connection import create_session_factory
+from models import Application, ChecklistAssignment
+from models.core.checklists import Checklist
+from models.core.controls import Control
+from models.core.evidence_blobs import EvidenceReference
+from models.core.user_responses import UserResponse
+from models.schemas.crud_schemas import UserOut
+from services.storage.backends import storage_for_path
+
+# Evidence downloads running at once; also bounds how many finished
+# downloads wait to be written, so memory doesn't grow with the app size.
+EVIDENCE_WORKERS = 8
+# Evidence files up to this size are buffered in memory, larger ones on disk
+EVIDENCE_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+class _ZipStream:
+    """
+    Write-only file object for ZipFile. Everything written is kept until
+    `drain()` hands it to the response, so the archive never has to be
+    held in memory or on disk as a whole.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", value).strip("._") or "unnamed"
+
+
+def _evidence_name(evidence_path: str, file_name: str | None = None) -> str:
+    """Path of an evidence object inside the archive."""
+    if evidence_path.startswith("s3://"):
+        # s3://<bucket>/user_uploads/<user_id>/<control_id>/<file name>
+        evidence_path = evidence_path[len("s3://") :].split("/", 1)[-1]
+    sha256 = blob_sha256(evidence_path)
+    if sha256:
+        # Blob keys are bare hashes; keep the name it was uploaded as
+        parts = ["sha256", sha256, *([_safe_name(file_name)] if file_name else [])]
+    else:
+        parts = [_safe_name(part) for part in evidence_path.split("/") if part]
+    return "/".join(["evidence", *parts])
+
+
+def _fetch_evidence(evidence_path: str):
+    """Download one evidence object into a spooled temp file."""
+    spool = SpooledTemporaryFile(max_size=EVIDENCE_SPOOL_MAX_SIZE)
+    try:
+        storage_for_path(evidence_path).download(evidence_path, spool)
+        spool.seek(0)
+        return spool
+    except Exception:
+        spool.close()
+        raise
+
+
+def _exportable_checklists(app: Application, db: Session, current_user: UserOut):
+    stmt = (
+        select(Checklist.id, Checklist.checklist_type)
+        .where(and_(Checklist.app_id == app.id, Checklist.is_active))
+        .order_by(Checklist.checklist_type, Checklist.id)
+    )
+    if current_user.role != "admin" and app.owner_id != current_user.id:
+        # Same rule as the checklist listing: only the ones assigned to them
+        stmt = stmt.where(
+            select(ChecklistAssignment.id)
+            .where(
+                ChecklistAssignment.checklist_id == Checklist.id,
+                ChecklistAssignment.user_id == current_user.id,
+            )
+            .exists()
+        )
+    return db.execute(stmt).all()
+
+
+def _zip_chunks(checklists: list, file_format: str):
+    stream = _ZipStream()
+    stream_checklist = (
+        stream_controls_xlsx if file_format == "xlsx" else stream_controls_csv
+    )
+    with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for checklist_id, checklist_type in checklists:
+            name = f"checklists/{_safe_name(checklist_type)}_{checklist_id[:8]}.{file_format}"
+            with archive.open(name, mode="w") as entry:
+                for chunk in stream_checklist(checklist_id):
+                    entry.write(chunk.encode() if isinstance(chunk, str) else chunk)
+                    yield stream.drain()
+        yield stream.drain()
+
+        SessionLocal = create_session_factory()
+        with SessionLocal() as db:
+            evidence_files = dict(
+                db.execute(
+                    select(
+                        UserResponse.evidence_path,
+                        func.min(EvidenceReference.file_name),
+                    )
+                    .join(Control, UserResponse.control_id == Control.id)
+                    .outerjoin(
+                        EvidenceReference,
+                        EvidenceReference.response_id == UserResponse.id,
+                    )
+                    .where(
+                        Control.checklist_id.in_([c_id for c_id, _ in checklists]),
+                        UserResponse.evidence_path.is_not(None),
+                        UserResponse.evidence_path != "",
+                    )
+                    .group_by(UserResponse.evidence_path)
+                    .order_by(UserResponse.evidence_path)
+                ).all()
+            )
+
+        missing = []
+        with ThreadPoolExecutor(max_workers=EVIDENCE_WORKERS) as pool:
+            pending = deque()
+            paths = iter(evidence_files)
+            # Keep at most EVIDENCE_WORKERS downloads in flight and write
+            # them out in order as they finish
+            for path in paths:
+                pending.append((path, pool.submit(_fetch_evidence, path)))
+                if len(pending) >= EVIDENCE_WORKERS:
+                    break
+            while pending:
+                path, future = pending.popleft()
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.append((next_path, pool.submit(_fetch_evidence, next_path)))
+                try:
+                    evidence = future.result()
+                except (BotoCoreError, ClientError, OSError, HTTPException) as e:
+                    missing.append(f"{path}\t{e}")
+                    continue
+                size = evidence.seek(0, os.SEEK_END)
+                evidence.seek(0)
+                with evidence, archive.open(
+                    _evidence_name(path, evidence_files[path]),
+                    mode="w",
+                    force_zip64=size >= zipfile.ZIP64_LIMIT,
+                ) as entry:
+                    while chunk := evidence.read(COPY_CHUNK_SIZE):
+                        entry.write(chunk)
+                        yield stream.drain()
+
+        if missing:
+            archive.writestr("evidence/MISSING.txt", "\n".join(missing) + "\n")
+    yield stream.drain()
+
+
+def stream_application_zip(checklists: list, file_format: str):
+    return (chunk for chunk in _zip_chunks(checklists, file_format) if chunk)
+
+
+def export_application(
+    app_id: str, db: Session, current_user: UserOut, file_format: str = "csv"
+):
+    app = db.get(Application, app_id)
+    if not app or (
+        current_user.role != "admin"
+        and not db.scalar(
+            select(Application.id).where(
+                Application.id == app_id, visible_to_user(current_user.id)
+            )
+        )
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Application not found. {app_id}",
+        )
+
+    checklists = _exportable_checklists(app, db, current_user)
+    if not checklists:
+        raise HTTPException(status_code=404, detail="No checklists found")
+
+    return StreamingResponse(
+        stream_application_zip(checklists, file_format),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename={_safe_name(app.name)}_export.zip"
+        },
+    )
@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from models.core.jobs import Job
+from models.schemas.crud_schemas import JobOut, UserOut
+from services.jobs import runner as jobs
+
+
+def _as_utc(value: datetime) -> datetime:
+    # MySQL DATETIME comes back naive; every timestamp is written in UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def get_job(job_id: str, db: Session, current_user: UserOut) -> JobOut:
+    job = db.get(Job, job_id)
+    if not job or (current_user.role != "admin" and job.user_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Job not found {job_id}"
+        )
+
+    job_out = JobOut.model_validate(job)
+    if job.status == "running" and (live := jobs.live_progress(job.id)):
+        job_out.rows_processed = live["rows_processed"]
+        job_out.rows_failed = live["rows_failed"]
+    if job.started_at:
+        ended = _as_utc(job.finished_at) if job.finished_at else datetime.now(timezone.utc)
+        elapsed = (ended - _as_utc(job.started_at)).total_seconds()
+        if elapsed > 0:
+            job_out.throughput = round(job_out.rows_processed / elapsed, 1)
+    return job_out
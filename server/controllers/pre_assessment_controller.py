@@ -5,11 +5,11 @@ from models.pre_assessment.sections import Section
 from models.pre_assessment.submissions import Submission
 from models import Application
 from models.schemas.params import PreAssessmentParams
+from db.pagination import fetch_page
 from fastapi import HTTPException, status
-from sqlalchemy import select, desc, asc, func
+from sqlalchemy import select, desc
 from sqlalchemy.orm import Session
 from datetime import date
-from services.notifications.email_notify import send_email
 from .pre_assessment_drafts import delete_draft
 
 from models.schemas.pre_assessment_schema import (
@@ -324,14 +324,7 @@ def get_assessment_submissions_for_admin(
 
         sort_column = getattr(Submission, params.sort_by)
 
-        if params.sort_order == "desc":
-            sort_column = desc(sort_column)
-        else:
-            sort_column = asc(sort_column)
-
-        stmt = select(Submission).order_by(sort_column)
-
-        total_count = db.scalar(select(func.count()).select_from(stmt.subquery()))
+        stmt = select(Submission)
 
         if (
             params.search
@@ -343,15 +336,16 @@ def get_assessment_submissions_for_admin(
             search_column = getattr(Submission, params.search_by)
             stmt = stmt.where(search_column.ilike(search_value))
 
-        if params.page >= 1:
-            submissions = db.scalars(
-                stmt.limit(params.page_size).offset(
-                    (params.page_size * params.page - params.page_size)
-                )
-            ).all()
-
-        else:
-            submissions = db.scalars(stmt).all()
+        page = fetch_page(
+            db,
+            stmt,
+            keys=[(sort_column, params.sort_order), (Submission.id, params.sort_order)],
+            page=params.page,
+            page_size=params.page_size,
+            cursor=params.cursor,
+            include_total=params.include_total,
+        )
+        submissions = [row[0] for row in page.rows]
 
         result = []
         for sub in submissions:
@@ -369,7 +363,14 @@ def get_assessment_submissions_for_admin(
                 )
             )
 
-        return {"total_count": total_count, "submissions": result}
+        return {
+            "total_count": page.total_count,
+            "submissions": result,
+            "next_cursor": page.next_cursor,
+        }
+
+    except HTTPException:
+        raise
 
     except Exception as e:
         raise HTTPException(
@@ -388,17 +389,7 @@ def get_assessment_submissions_for_user(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid sort_by field: {params.sort_by}",
             )
-        if params.sort_order == "desc":
-            sort_column = desc(sort_column)
-        else:
-            sort_column = asc(sort_column)
-
-        stmt = (
-            select(Submission)
-            .where(Submission.user_id == user_id)
-            .order_by(sort_column)
-        )
-        total_count = db.scalar(select(func.count()).select_from(stmt.subquery()))
+        stmt = select(Submission).where(Submission.user_id == user_id)
 
         if (
             params.search
@@ -410,15 +401,16 @@ def get_assessment_submissions_for_user(
             search_column = getattr(Submission, params.search_by)
             stmt = stmt.where(search_column.ilike(search_value))
 
-        if params.page >= 1:
-            submissions = db.scalars(
-                stmt.limit(params.page_size).offset(
-                    (params.page_size * params.page - params.page_size)
-                )
-            ).all()
-
-        else:
-            submissions = db.scalars(stmt).all()
+        page = fetch_page(
+            db,
+            stmt,
+            keys=[(sort_column, params.sort_order), (Submission.id, params.sort_order)],
+            page=params.page,
+            page_size=params.page_size,
+            cursor=params.cursor,
+            include_total=params.include_total,
+        )
+        submissions = [row[0] for row in page.rows]
 
         result = []
         for sub in submissions:
@@ -436,7 +428,13 @@ def get_assessment_submissions_for_user(
                 )
             )
 
-        return {"total_count": total_count, "submissions": result}
+        return {
+            "total_count": page.total_count,
+            "submissions": result,
+            "next_cursor": page.next_cursor,
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
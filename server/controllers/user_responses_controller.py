@@ -1,18 +1,22 @@
 import os
-import shutil
-from io import BytesIO
+import uuid
+from datetime import datetime, timezone
+from typing import BinaryIO, Callable
 
-import pandas as pd
 from fastapi import HTTPException, UploadFile, status
-from sqlalchemy import and_, select
+from sqlalchemy import and_, or_, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.orm import Session
-
-import boto3
-from botocore.exceptions import ClientError
-from botocore.config import Config
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from models.core.controls import Control
 from models.schemas.crud_schemas import (
+    EvidenceUploadCreate,
+    EvidenceUploadFinalize,
+    EvidenceUploadOut,
+    EvidenceUrlOut,
+    EvidenceUrlsOut,
     UserOut,
     UserResponseCreate,
     UserResponseCreateBulk,
@@ -20,19 +24,38 @@ from models.schemas.crud_schemas import (
     UserResponseUpdate,
 )
 from models import ChecklistAssignment
-from .checklist_controller import update_checklist_status
 from models.core.user_responses import UserResponse
 from models.core.checklists import Checklist
-import mimetypes
+from controllers.evidence_controller import (
+    delete_evidence_file,
+    link_evidence,
+    store_evidence_blob,
+)
+from db.events.status_rollup import adjust_counts
+from services.imports.sheet_reader import iter_sheet_chunks
+from services.previews.worker import preview_path
+from services.storage.backends import get_storage, storage_for_path
+from services.storage.config import Config as StorageConfig
+from services.storage.url_cache import signed_urls
 
 
-ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
-UPLOAD_DIR = os.path.join(ROOT_DIR, "uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+UPSERT_INSERTS = {
+    "mysql": mysql.insert,
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+UPSERT_UPDATE_COLUMNS = ["current_setting", "review_comment", "updated_at"]
+RESPONSE_UPSERT_CHUNK_SIZE = 1000
+# Per-row results returned for an upload; the counts always cover every row
+RESPONSE_RESULTS_LIMIT = 5000
 
 
 def add_user_response(
-    payload: UserResponseCreate, control_id: str, db: Session, current_user: UserOut
+    payload: UserResponseCreate,
+    control_id: str,
+    db: Session,
+    current_user: UserOut,
+    evidence_name: str | None = None,
 ):
     try:
         # Fetch the control
@@ -68,11 +91,14 @@ def add_user_response(
         )
 
         db.add(response)
+        if payload.evidence_path:
+            link_evidence(db, response, evidence_name)
+        adjust_counts(db, control.checklist_id, responses=1)
+        db.flush()
+        result = UserResponseOut.model_validate(response)
         db.commit()
-        db.refresh(response)
 
-        update_checklist_status(checklist_id=control.checklist_id, db=db)
-        return UserResponseOut.model_validate(response)
+        return result
 
     except HTTPException:
         raise
@@ -84,6 +110,24 @@ def add_user_response(
         )
 
 
+async def add_user_response_async(
+    payload: UserResponseCreate,
+    control_id: str,
+    db: AsyncSession,
+    current_user: UserOut,
+    evidence_name: str | None = None,
+):
+    return await db.run_sync(
+        lambda session: add_user_response(
+            payload=payload,
+            control_id=control_id,
+            db=session,
+            current_user=current_user,
+            evidence_name=evidence_name,
+        )
+    )
+
+
 def save_bulk_responses(
     payload: list[UserResponseCreateBulk],
     checklist_id: str,
@@ -97,11 +141,17 @@ def save_bulk_responses(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Checklist doesn't esist for writing responses",
             )
-        new_responses = [UserResponse(**res.model_dump()) for res in payload]
+        new_responses = [
+            UserResponse(
+                **res.model_dump(),
+                checklist_id=checklist.id,
+                user_id=current_user.id,
+            )
+            for res in payload
+        ]
         db.add_all(new_responses)
+        adjust_counts(db, checklist.id, responses=len(new_responses))
         db.commit()
-        for r in new_responses:
-            db.refresh(r)
     except HTTPException:
         raise
     except Exception as e:
@@ -112,7 +162,11 @@ def save_bulk_responses(
 
 
 def update_user_response(
-    payload: UserResponseUpdate, response_id: str, db: Session, current_user: UserOut
+    payload: UserResponseUpdate,
+    response_id: str,
+    db: Session,
+    current_user: UserOut,
+    evidence_name: str | None = None,
 ) -> UserResponseOut:
     response = db.scalar(select(UserResponse).where(UserResponse.id == response_id))
     if not response:
@@ -133,95 +187,257 @@ def update_user_response(
             detail="You are not allowed to edit this response",
         )
     try:
-        for key, val in payload.model_dump(exclude_unset=True).items():
+        old_evidence_path = response.evidence_path
+        values = payload.model_dump(exclude_unset=True)
+        for key, val in values.items():
             setattr(response, key, val)
+        if "evidence_path" in values:
+            # A blob only loses this response's reference; pruning removes it
+            link_evidence(db, response, evidence_name)
 
+        db.flush()
+        result = UserResponseOut.model_validate(response)
         db.commit()
-        db.refresh(response)
-        return UserResponseOut.model_validate(response)
-
     except Exception as e:
         db.rollback()
         raise HTTPException(500, f"Failed to update response: {e}")
 
+    # Only once the caller is known to be allowed and the change is saved
+    if old_evidence_path and old_evidence_path != result.evidence_path:
+        delete_evidence_file(old_evidence_path)
+    return result
 
-def save_uploaded_file_old(
-    file: UploadFile | None, user_id: str, control_id: str
-) -> str | None:
+
+async def save_uploaded_file(file: UploadFile | None) -> str | None:
+    """
+    Store an evidence upload and return its path. Content already stored
+    for any response is not uploaded again; the response shares that blob.
+    The spooled upload file is read in the threadpool, once to hash it
+    and, for new content, again part by part by the backend.
+    """
     if not file:
         return None
 
-    file_name = f"{user_id}_{control_id}_{file.filename}"
-    file_path = os.path.join(UPLOAD_DIR, file_name)
+    return await run_in_threadpool(store_evidence_blob, file.file, file.filename)
 
-    if os.path.exists(file_path):
-        os.remove(file_path)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    return f"{file_name}"
 
+def evidence_prefix(user_id: str, control_id: str) -> str:
+    return f"user_uploads/{user_id}/{control_id}/"
 
-# ---- S3 CONFIG ----
-S3_BUCKET = "infosec-securityassesment"
-s3_client = boto3.client(
-    "s3", region_name="ap-south-1", config=Config(signature_version="s3v4")
-)
 
+def _check_response_access(control_id: str, db: Session, current_user: UserOut):
+    control = db.get(Control, control_id)
+    if not control:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Control not found {control_id}",
+        )
+    if current_user.role != "admin" and not db.scalar(
+        select(ChecklistAssignment.user_id).where(
+            ChecklistAssignment.checklist_id == control.checklist_id,
+            ChecklistAssignment.user_id == current_user.id,
+        )
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not allowed to respond to this control",
+        )
+    return control
 
-def save_uploaded_file(
-    file: UploadFile | None, user_id: str, control_id: str
-) -> str | None:
-    if not file:
-        return None
 
-    file_key = f"user_uploads/{user_id}/{control_id}/{file.filename}"
-    content_type, _ = mimetypes.guess_type(file.filename)
-    if content_type is None:
-        content_type = "application/octet-stream"
+def create_evidence_upload(
+    payload: EvidenceUploadCreate, control_id: str, db: Session, current_user: UserOut
+) -> EvidenceUploadOut:
+    """
+    A presigned POST the browser uploads one evidence file with, straight
+    to storage. The key is fixed under the user's prefix for the control.
+    """
+    _check_response_access(control_id, db, current_user)
 
-    try:
-        s3_client.upload_fileobj(
-            file.file,
-            S3_BUCKET,
-            file_key,
-            ExtraArgs={
-                "ACL": "private",
-                "ContentType": content_type,
-                "ContentDisposition": "inline",
-            },
+    content_type = payload.content_type.split(";")[0].strip().lower()
+    if content_type not in StorageConfig.DIRECT_UPLOAD_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"File type not allowed: {payload.content_type}",
         )
+    max_size = StorageConfig.DIRECT_UPLOAD_MAX_SIZE
+    if payload.size is not None and payload.size > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"File is larger than {max_size} bytes",
+        )
+    file_name = os.path.basename(payload.file_name.replace("\\", "/")).strip()
+    if not file_name or file_name in (".", ".."):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file name",
+        )
+
+    file_key = f"{evidence_prefix(current_user.id, control_id)}{file_name}"
+    expires_in = StorageConfig.DIRECT_UPLOAD_EXPIRES_IN
+    post = get_storage().presigned_post(file_key, content_type, max_size, expires_in)
+    return EvidenceUploadOut(
+        url=post["url"],
+        fields=post["fields"],
+        file_key=file_key,
+        max_size=max_size,
+        expires_in=expires_in,
+    )
+
 
-        return f"s3://{S3_BUCKET}/{file_key}"
+def finalize_evidence_upload(
+    payload: EvidenceUploadFinalize,
+    control_id: str,
+    db: Session,
+    current_user: UserOut,
+) -> UserResponseOut:
+    """
+    Record a direct upload as the evidence of the user's response to the
+    control, creating the response if there is none yet.
+    """
+    control = _check_response_access(control_id, db, current_user)
 
-    except ClientError as e:
+    file_key = payload.file_key
+    prefix = evidence_prefix(current_user.id, control_id)
+    if not file_key.startswith(prefix) or "/" in file_key[len(prefix) :]:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error uploading file to S3: {e}",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File key is outside your upload area for this control",
         )
 
+    storage = get_storage()
+    size = storage.size(file_key)
+    if size is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Upload not found {file_key}",
+        )
+    evidence_path = storage.path(file_key)
+
+    response = db.scalar(
+        select(UserResponse).where(
+            UserResponse.control_id == control_id,
+            UserResponse.user_id == current_user.id,
+        )
+    )
+    if not response:
+        return add_user_response(
+            UserResponseCreate(
+                current_setting=payload.current_setting or "",
+                review_comment=payload.review_comment or "",
+                evidence_path=evidence_path,
+            ),
+            control_id=control.id,
+            db=db,
+            current_user=current_user,
+        )
 
-def get_s3_presigned_url(file_key: str, expires_in: int = 3600) -> str:
+    return update_user_response(
+        UserResponseUpdate(
+            **payload.model_dump(
+                include={"current_setting", "review_comment"}, exclude_none=True
+            ),
+            evidence_path=evidence_path,
+        ),
+        response_id=response.id,
+        db=db,
+        current_user=current_user,
+    )
+
+
+def evidence_path_for_key(file_key: str) -> str:
+    """The stored evidence path for a key as the file-view link sends it."""
+    if file_key.startswith("s3://"):
+        return file_key
+    return get_storage().path(file_key)
+
+
+def check_evidence_access(evidence_path: str, db: Session, current_user: UserOut):
     """
-    Generates a pre-signed URL for a private S3 object.
-    file_key: S3 object key (e.g., "user_uploads/<user_id>/<control_id>/file.json")
-    expires_in: URL expiration in seconds (default 1 hour)
+    Only evidence on a response the user may see is signed: their own, or
+    one on a checklist assigned to them; admins see every response's.
+    Anything else is reported as not found.
     """
-    try:
-        url = s3_client.generate_presigned_url(
-            "get_object",
-            Params={
-                "Bucket": S3_BUCKET,
-                "Key": file_key,
-                "ResponseContentDisposition": "inline",
-            },
-            ExpiresIn=expires_in,
+    stmt = select(UserResponse.id).where(UserResponse.evidence_path == evidence_path)
+    if current_user.role != "admin":
+        assigned = (
+            select(ChecklistAssignment.id)
+            .where(
+                ChecklistAssignment.checklist_id == UserResponse.checklist_id,
+                ChecklistAssignment.user_id == current_user.id,
+            )
+            .exists()
         )
-        return url
-    except ClientError as e:
+        stmt = stmt.where(or_(UserResponse.user_id == current_user.id, assigned))
+    if db.scalar(stmt.limit(1)) is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error generating S3 URL: {e}",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Evidence not found {evidence_path}",
+        )
+
+
+def cached_evidence_url(path: str, user_id: str) -> tuple[str, float]:
+    """
+    View URL for a stored evidence path and the epoch time it expires at,
+    signed at most once per cache lifetime for each user.
+    """
+    return signed_urls.get_or_sign(
+        path,
+        user_id,
+        StorageConfig.SIGNED_URL_EXPIRES_IN,
+        lambda path, expires_in: storage_for_path(path).url(path, expires_in),
+    )
+
+
+def cached_preview_url(path: str, user_id: str) -> tuple[str, float] | None:
+    """
+    Like `cached_evidence_url`, for the preview of an image. None while
+    there is no preview, which is checked on a cache miss only.
+    """
+    preview = preview_path(path)
+    hit = signed_urls.get(preview, user_id)
+    if hit:
+        return hit
+    if storage_for_path(preview).size(preview) is None:
+        return None
+    return cached_evidence_url(preview, user_id)
+
+
+def get_checklist_evidence_urls(
+    checklist_id: str, db: Session, current_user: UserOut
+) -> EvidenceUrlsOut:
+    """View URLs for every evidence file on the checklist, in one call."""
+    check_checklist_access(checklist_id, db, current_user)
+
+    rows = db.execute(
+        select(
+            UserResponse.id,
+            UserResponse.control_id,
+            UserResponse.user_id,
+            UserResponse.evidence_path,
+        )
+        .join(Control, UserResponse.control_id == Control.id)
+        .where(
+            Control.checklist_id == checklist_id,
+            UserResponse.evidence_path.is_not(None),
+            UserResponse.evidence_path != "",
+        )
+    ).all()
+
+    urls = []
+    for response_id, control_id, user_id, evidence_path in rows:
+        url, expires_at = cached_evidence_url(evidence_path, current_user.id)
+        urls.append(
+            EvidenceUrlOut(
+                response_id=response_id,
+                control_id=control_id,
+                user_id=user_id,
+                evidence_path=evidence_path,
+                url=url,
+                expires_at=datetime.fromtimestamp(expires_at, timezone.utc),
+            )
         )
+    return EvidenceUrlsOut(checklist_id=checklist_id, urls=urls)
 
 
 def isResponded(control_id: str, db: Session):
@@ -243,69 +459,184 @@ def isResponded(control_id: str, db: Session):
         )
 
 
+def _upsert_responses(db: Session, records: list[dict]) -> None:
+    """
+    INSERT the responses, or overwrite the answer of the one the same user
+    already has on the control (unique on control_id, user_id).
+    """
+    dialect = db.get_bind().dialect.name
+    stmt = UPSERT_INSERTS[dialect](UserResponse)
+    if dialect == "mysql":
+        stmt = stmt.on_duplicate_key_update(
+            {column: stmt.inserted[column] for column in UPSERT_UPDATE_COLUMNS}
+        )
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["control_id", "user_id"],
+            set_={column: stmt.excluded[column] for column in UPSERT_UPDATE_COLUMNS},
+        )
+    for start in range(0, len(records), RESPONSE_UPSERT_CHUNK_SIZE):
+        db.execute(stmt, records[start : start + RESPONSE_UPSERT_CHUNK_SIZE])
+
+
+def check_checklist_access(checklist_id: str, db: Session, current_user: UserOut):
+    """Return the checklist if it exists and the user may work on its responses."""
+    checklist = db.get(Checklist, checklist_id)
+    if not checklist:
+        raise HTTPException(404, f"Checklist {checklist_id} not found")
+
+    # For uploads this is the only authorisation check; it covers every row
+    assigned_user_ids = [a.user_id for a in checklist.assignments]
+    if current_user.role != "admin" and current_user.id not in assigned_user_ids:
+        raise HTTPException(403, "Not authorized for this checklist")
+    return checklist
+
+
 def add_responses_from_csv(
-    file_content: bytes,
+    file: BinaryIO,
     file_name: str,
     current_user: UserOut,
     checklist_id: str,
     db: Session,
+    progress: Callable[[int, int], None] | None = None,
 ):
+    """
+    Import responses chunk by chunk straight from the upload file, upserting
+    each chunk as it is parsed, in one transaction. Row statuses are
+    relative to the checklist before the upload: "inserted" for a new
+    response, "updated" for an existing one, "skipped" when a later row for
+    the same control and user overrides it. `progress` is called after
+    every chunk with the rows processed and failed so far.
+    """
     try:
-        checklist = db.get(Checklist, checklist_id)
-        if not checklist:
-            raise HTTPException(404, f"Checklist {checklist_id} not found")
+        check_checklist_access(checklist_id, db, current_user)
 
-        assigned_user_ids = [a.user_id for a in checklist.assignments]
-        if current_user.role != "admin" and current_user.id not in assigned_user_ids:
-            raise HTTPException(403, "Not authorized for this checklist")
-
-        df = (
-            pd.read_csv(BytesIO(file_content))
-            if file_name.endswith(".csv")
-            else pd.read_excel(BytesIO(file_content))
+        control_ids = set(
+            db.scalars(select(Control.id).where(Control.checklist_id == checklist_id))
         )
-        df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
+        # Response id per (control_id, user_id) already on the checklist
+        existing = {
+            (control_id, user_id): r_id
+            for r_id, control_id, user_id in db.execute(
+                select(UserResponse.id, UserResponse.control_id, UserResponse.user_id)
+                .join(Control, UserResponse.control_id == Control.id)
+                .where(Control.checklist_id == checklist_id)
+            )
+        }
+        new_ids = {}  # response ids created by this upload, by key
+        written = {}  # sheet row that last wrote each key
+        results = {}  # per-row results, up to RESPONSE_RESULTS_LIMIT rows
+        failed = skipped = total_rows = 0
+        now = datetime.now(timezone.utc)
 
         required = {"control_id", "current_setting", "review_comment"}
-        missing = required - set(df.columns)
-        if missing:
-            raise HTTPException(400, f"Missing columns: {', '.join(missing)}")
-
-        df = df.dropna(subset=["control_id"]).fillna("")
-        control_ids_in_checklist = {c.id for c in checklist.controls}
-
-        for c_id in df["control_id"]:
-            if c_id not in control_ids_in_checklist:
-                raise HTTPException(400, f"Control ID {c_id} not found in checklist")
-
-        new_objs, updated_ids = [], []
-
-        for _, row in df.iterrows():
-            if pd.notna(row.get("response_id")):
-                updated_ids.append(row["response_id"])
-                payload = UserResponseUpdate(
-                    current_setting=str(row["current_setting"]),
-                    review_comment=str(row["review_comment"]),
-                )
-                update_user_response(payload, str(row["response_id"]), db, current_user)
-            else:
-                new_objs.append(
-                    UserResponse(
-                        control_id=str(row["control_id"]),
-                        checklist_id=checklist_id,
-                        user_id=current_user.id,
-                        current_setting=str(row["current_setting"]),
-                        review_comment=str(row["review_comment"]),
+        for chunk in iter_sheet_chunks(file, file_name):
+            missing = required - set(chunk.columns)
+            if missing:
+                raise HTTPException(400, f"Missing columns: {', '.join(missing)}")
+
+            chunk = chunk.reindex(columns=[*sorted(required), "response_id"]).fillna("")
+            chunk["control_id"] = chunk["control_id"].str.strip()
+            chunk["response_id"] = chunk["response_id"].str.strip()
+            chunk["row"] = chunk.index
+            total_rows += len(chunk)
+
+            # Owner and control of the responses the chunk refers to by id
+            referenced = {}
+            response_ids = [r_id for r_id in chunk["response_id"].unique() if r_id]
+            if response_ids:
+                referenced = {
+                    r_id: (control_id, user_id)
+                    for r_id, control_id, user_id in db.execute(
+                        select(
+                            UserResponse.id,
+                            UserResponse.control_id,
+                            UserResponse.user_id,
+                        )
+                        .join(Control, UserResponse.control_id == Control.id)
+                        .where(
+                            Control.checklist_id == checklist_id,
+                            UserResponse.id.in_(response_ids),
+                        )
                     )
+                }
+
+            records = {}
+            for row in chunk.to_dict("records"):
+                result = {"row": row["row"], "control_id": row["control_id"]}
+                if len(results) < RESPONSE_RESULTS_LIMIT:
+                    results[row["row"]] = result
+
+                error = None
+                user_id = current_user.id
+                if not row["control_id"]:
+                    error = "control_id is required"
+                elif row["control_id"] not in control_ids:
+                    error = "Control not found in checklist"
+                elif row["response_id"]:
+                    if row["response_id"] not in referenced:
+                        error = "Response not found in checklist"
+                    else:
+                        response_control_id, user_id = referenced[row["response_id"]]
+                        if response_control_id != row["control_id"]:
+                            error = "Response belongs to another control"
+                if error:
+                    result.update(status="error", error=error)
+                    failed += 1
+                    continue
+
+                key = (row["control_id"], user_id)
+                if key in written:
+                    skipped += 1
+                    if written[key] in results:
+                        results[written[key]] = {
+                            "row": written[key],
+                            "control_id": key[0],
+                            "status": "skipped",
+                            "error": f"Superseded by row {row['row']} for the same control",
+                        }
+                written[key] = row["row"]
+
+                if key not in existing and key not in new_ids:
+                    new_ids[key] = str(uuid.uuid4())
+                response_id = existing.get(key) or new_ids[key]
+                result.update(
+                    status="updated" if key in existing else "inserted",
+                    response_id=response_id,
                 )
+                records[key] = {
+                    "id": response_id,
+                    "control_id": key[0],
+                    "checklist_id": checklist_id,
+                    "user_id": key[1],
+                    "current_setting": row["current_setting"],
+                    "review_comment": row["review_comment"],
+                    "created_at": now,
+                    "updated_at": now,
+                    "is_active": True,
+                }
+
+            _upsert_responses(db, list(records.values()))
+            if progress:
+                progress(total_rows, failed)
+
+        inserted = len(new_ids)
+        # One counter update, so the status rollup runs once at commit
+        adjust_counts(db, checklist_id, responses=inserted)
+        db.commit()
 
-        if new_objs:
-            db.bulk_save_objects(new_objs)
-            db.commit()
-
-        update_checklist_status(checklist_id=checklist_id, db=db)
-        return {"msg": f"Processed {len(df)} rows successfully"}
+        return {
+            "msg": f"Processed {total_rows} rows successfully",
+            "inserted": inserted,
+            "updated": len(written) - inserted,
+            "failed": failed,
+            "skipped": skipped,
+            "results": list(results.values()),
+        }
 
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(500, f"Error processing CSV: {e}")
@@ -7,6 +7,8 @@ class DBConfig(BaseSettings):
     MAX_OVERFLOW: int
     POOL_TIMEOUT: int
     POOL_RECYCLE: int
+    # Async driver URL for the route layer. Derived from DATABASE_URL when unset.
+    ASYNC_DATABASE_URL: str | None = None
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -1,17 +1,92 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy import Engine, create_engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
+
+from services.extensions.metrics import TimedAsyncQueuePool, TimedQueuePool
 
 from .base import Base
 from .config import Config
 
+# One engine (and therefore one connection pool) per worker process.
+# Created in the FastAPI lifespan and disposed on shutdown.
+_engine: Engine | None = None
+_SessionLocal: sessionmaker[Session] | None = None
+_async_engine: AsyncEngine | None = None
+_AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+# Sync driver -> async driver used when ASYNC_DATABASE_URL is not set.
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
 
-def create_db_engine():
+def create_db_engine() -> Engine:
     engine = create_engine(
         url=Config.DATABASE_URL,
-        poolclass=QueuePool,
+        poolclass=TimedQueuePool,
+        pool_size=Config.POOL_SIZE,
+        max_overflow=Config.MAX_OVERFLOW,
+        pool_timeout=Config.POOL_TIMEOUT,
+        pool_recycle=Config.POOL_RECYCLE,
+        echo=False,
+    )
+    return engine
+
+
+def get_engine() -> Engine:
+    """Return the process-wide engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = create_db_engine()
+    return _engine
+
+
+def create_session_factory() -> sessionmaker[Session]:
+    """Return the process-wide session factory bound to the shared engine."""
+    global _SessionLocal
+    if _SessionLocal is None:
+        _SessionLocal = sessionmaker(
+            autoflush=False, autocommit=False, bind=get_engine()
+        )
+    return _SessionLocal
+
+
+def warm_pool(engine: Engine, size: int) -> None:
+    """
+    Open `size` connections up front so the first requests after a deploy
+    don't pay the TCP + auth handshake to MySQL.
+    """
+    conns = []
+    try:
+        for _ in range(size):
+            conns.append(engine.connect())
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+def get_async_database_url() -> str:
+    if Config.ASYNC_DATABASE_URL:
+        return Config.ASYNC_DATABASE_URL
+    url = make_url(Config.DATABASE_URL)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def create_async_db_engine() -> AsyncEngine:
+    engine = create_async_engine(
+        url=get_async_database_url(),
+        poolclass=TimedAsyncQueuePool,
         pool_size=Config.POOL_SIZE,
         max_overflow=Config.MAX_OVERFLOW,
         pool_timeout=Config.POOL_TIMEOUT,
@@ -21,10 +96,53 @@ def create_db_engine():
     return engine
 
 
-def create_session_factory():
-    engine = create_db_engine()
-    SessionLocal = sessionmaker(autoflush=False, autocommit=False, bind=engine)
-    return SessionLocal
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide async engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine()
+    return _async_engine
+
+
+def create_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        _AsyncSessionLocal = async_sessionmaker(
+            autoflush=False, autocommit=False, bind=get_async_engine()
+        )
+    return _AsyncSessionLocal
+
+
+async def warm_async_pool(engine: AsyncEngine, size: int) -> None:
+    conns = []
+    try:
+        for _ in range(size):
+            conns.append(await engine.connect())
+    finally:
+        for conn in conns:
+            await conn.close()
+
+
+async def init_engine() -> Engine:
+    engine = get_engine()
+    create_session_factory()
+    warm_pool(engine, Config.POOL_SIZE)
+
+    create_async_session_factory()
+    await warm_async_pool(get_async_engine(), Config.POOL_SIZE)
+    return engine
+
+
+async def dispose_engine() -> None:
+    global _engine, _SessionLocal, _async_engine, _AsyncSessionLocal
+    if _engine is not None:
+        _engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _engine = None
+    _SessionLocal = None
+    _async_engine = None
+    _AsyncSessionLocal = None
 
 
 def get_db_conn() -> Generator:
@@ -39,6 +157,15 @@ def get_db_conn() -> Generator:
         db.close()
 
 
+async def get_async_db_conn() -> AsyncGenerator[AsyncSession, None]:
+    AsyncSessionLocal = create_async_session_factory()
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+
 def init_db():
-    engine = create_db_engine()
-    Base.metadata.create_all(engine)
+    Base.metadata.create_all(get_engine())
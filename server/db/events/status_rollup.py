@@ -0,0 +1,337 @@
+"""
+Checklist and application status rollup.
+
+Writes mark the checklists/applications whose status may have changed;
+nothing is recomputed while the unit of work is in progress. Right before
+the transaction commits, every dirty checklist is recomputed from its
+counters and every affected application from an aggregate over its
+checklists, each with one set-based UPDATE.
+
+Status rules:
+    checklist: pending with no controls or no responses, completed when
+        every control has a response, in-progress otherwise. A checklist
+        an admin approved or rejected keeps that status.
+    application: pending with no checklists, completed when every checklist
+        is completed, in-progress when any checklist is completed or
+        in-progress, pending otherwise.
+"""
+
+import time
+from collections.abc import Iterable
+
+from sqlalchemy import (
+    and_,
+    case,
+    event,
+    func,
+    inspect,
+    not_,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from models.core.applications import Application
+from models.core.checklists import Checklist
+from models.core.controls import Control
+from models.core.user_responses import UserResponse
+
+DIRTY_CHECKLISTS = "rollup_dirty_checklists"
+DIRTY_APPS = "rollup_dirty_apps"
+CHUNK_SIZE = 500
+# Set by an admin through the evaluate endpoint, never derived from counters
+EVALUATED_STATUSES = ("approved", "rejected")
+
+# Checklist columns whose change can change the application's status
+_APP_INPUTS = ("status", "is_completed", "is_active", "app_id")
+
+
+def mark_checklists_dirty(session: Session, checklist_ids: Iterable[str]) -> None:
+    session.info.setdefault(DIRTY_CHECKLISTS, set()).update(checklist_ids)
+
+
+def mark_apps_dirty(session: Session, app_ids: Iterable[str]) -> None:
+    session.info.setdefault(DIRTY_APPS, set()).update(
+        app_id for app_id in app_ids if app_id
+    )
+
+
+def adjust_counts(
+    db: Session, checklist_id: str, controls: int = 0, responses: int = 0
+) -> None:
+    """
+    Add `controls`/`responses` (negative to subtract) to a checklist's
+    counters and mark it for the status rollup. The increment is done in SQL
+    so concurrent writers don't overwrite each other, and runs in the
+    caller's transaction.
+    """
+    values = {}
+    if controls:
+        values["controls_count"] = Checklist.controls_count + controls
+    if responses:
+        values["responses_count"] = Checklist.responses_count + responses
+    if not values:
+        return
+    db.execute(update(Checklist).where(Checklist.id == checklist_id).values(**values))
+    mark_checklists_dirty(db, [checklist_id])
+
+
+def _chunks(ids: Iterable[str]):
+    ids = sorted(ids)
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start : start + CHUNK_SIZE]
+
+
+def _actual_counts():
+    """Correlated subqueries counting each checklist's controls and responses."""
+    actual_controls = (
+        select(func.count(Control.id))
+        .where(Control.checklist_id == Checklist.id)
+        .scalar_subquery()
+    )
+    actual_responses = (
+        select(func.count(UserResponse.id))
+        .join(Control, UserResponse.control_id == Control.id)
+        .where(Control.checklist_id == Checklist.id)
+        .scalar_subquery()
+    )
+    return actual_controls, actual_responses
+
+
+def _counts_drifted(actual_controls, actual_responses):
+    return or_(
+        Checklist.controls_count != actual_controls,
+        Checklist.responses_count != actual_responses,
+    )
+
+
+def _recount_update(criteria):
+    """Set the counters from the controls/user_responses tables where they drifted."""
+    actual_controls, actual_responses = _actual_counts()
+    return (
+        update(Checklist)
+        .where(criteria, _counts_drifted(actual_controls, actual_responses))
+        .values(controls_count=actual_controls, responses_count=actual_responses)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _checklist_status_update(
+    criteria, only_changed: bool = False, keep_evaluated: bool = True
+):
+    no_answers = (Checklist.controls_count == 0) | (Checklist.responses_count == 0)
+    new_status = case(
+        (no_answers, "pending"),
+        (Checklist.responses_count < Checklist.controls_count, "in-progress"),
+        else_="completed",
+    )
+    new_completed = and_(
+        not_(no_answers), Checklist.responses_count >= Checklist.controls_count
+    )
+    stmt = update(Checklist).where(criteria)
+    if keep_evaluated:
+        stmt = stmt.where(
+            or_(Checklist.status.is_(None), Checklist.status.not_in(EVALUATED_STATUSES))
+        )
+    if only_changed:
+        stmt = stmt.where(
+            or_(
+                Checklist.status.is_distinct_from(new_status),
+                Checklist.is_completed.is_distinct_from(new_completed),
+            )
+        )
+    return stmt.values(status=new_status, is_completed=new_completed).execution_options(
+        synchronize_session=False
+    )
+
+
+def _app_status_updates(app_criteria, only_changed: bool = False):
+    """
+    `app_criteria(column)` selects the applications by id. Returns the
+    UPDATE joined to the per-app checklist aggregate and the UPDATE for
+    applications without checklists.
+    """
+    totals = (
+        select(
+            Checklist.app_id.label("app_id"),
+            func.count(Checklist.id).label("total"),
+            func.sum(case((Checklist.is_completed, 1), else_=0)).label("done"),
+            func.sum(case((Checklist.status == "in-progress", 1), else_=0)).label(
+                "in_progress"
+            ),
+        )
+        .where(app_criteria(Checklist.app_id))
+        .group_by(Checklist.app_id)
+        .subquery()
+    )
+    new_status = case(
+        (totals.c.done == totals.c.total, "completed"),
+        ((totals.c.done > 0) | (totals.c.in_progress > 0), "in-progress"),
+        else_="pending",
+    )
+    new_completed = totals.c.done == totals.c.total
+
+    # UPDATE applications JOIN (SELECT app_id, ... GROUP BY app_id)
+    joined = update(Application).where(Application.id == totals.c.app_id)
+    empty = update(Application).where(
+        app_criteria(Application.id),
+        ~select(Checklist.id).where(Checklist.app_id == Application.id).exists(),
+    )
+    if only_changed:
+        joined = joined.where(
+            or_(
+                Application.status.is_distinct_from(new_status),
+                Application.is_completed.is_distinct_from(new_completed),
+            )
+        )
+        empty = empty.where(
+            or_(
+                Application.status.is_distinct_from("pending"),
+                Application.is_completed.is_distinct_from(False),
+            )
+        )
+    return [
+        joined.values(status=new_status, is_completed=new_completed),
+        empty.values(status="pending", is_completed=False),
+    ]
+
+
+def rollup_checklists(
+    session: Session, checklist_ids: Iterable[str], keep_evaluated: bool = True
+) -> set[str]:
+    """
+    Recompute checklist statuses from the counters. Returns their app ids.
+    Checklists evaluated by an admin keep their status unless
+    `keep_evaluated` is False.
+    """
+    app_ids = set()
+    for chunk in _chunks(checklist_ids):
+        session.execute(
+            _checklist_status_update(
+                Checklist.id.in_(chunk), keep_evaluated=keep_evaluated
+            )
+        )
+        app_ids.update(
+            session.scalars(
+                select(Checklist.app_id).where(Checklist.id.in_(chunk))
+            ).all()
+        )
+    return app_ids
+
+
+def rollup_apps(session: Session, app_ids: set[str]) -> None:
+    """Recompute application statuses from an aggregate of their checklists."""
+    for chunk in _chunks(app_ids):
+        for stmt in _app_status_updates(lambda column: column.in_(chunk)):
+            session.execute(stmt.execution_options(synchronize_session=False))
+
+
+def recount_checklists(session: Session) -> int:
+    """
+    Fix drifted checklist counters and mark those checklists dirty, so their
+    statuses and their applications' are rolled up on commit. Returns rows
+    changed.
+    """
+    drifted = session.scalars(
+        select(Checklist.id).where(_counts_drifted(*_actual_counts()))
+    ).all()
+    repaired = 0
+    for chunk in _chunks(drifted):
+        repaired += session.execute(_recount_update(Checklist.id.in_(chunk))).rowcount
+    mark_checklists_dirty(session, drifted)
+    return repaired
+
+
+def _pk_ranges(session: Session, column, size: int):
+    """
+    Yield (lower, upper] bounds splitting `column` into ranges of `size`
+    rows; `upper` is None for the last range.
+    """
+    lower = None
+    while True:
+        stmt = select(column).order_by(column).offset(size - 1).limit(1)
+        if lower is not None:
+            stmt = stmt.where(column > lower)
+        upper = session.scalar(stmt)
+        yield lower, upper
+        if upper is None:
+            return
+        lower = upper
+
+
+def _in_range(column, lower, upper):
+    return and_(
+        column > lower if lower is not None else true(),
+        column <= upper if upper is not None else true(),
+    )
+
+
+def recompute_all(session: Session, chunk_size: int = 5000) -> dict:
+    """
+    Recount and recompute every checklist and application status, e.g. after
+    a bulk import or manual edits. Works through primary-key ranges of
+    `chunk_size` rows and commits after each, so locks are held briefly.
+    Checklists evaluated by an admin (approved/rejected) keep their status.
+    """
+    started = time.perf_counter()
+    counters = checklists = apps = 0
+
+    for lower, upper in _pk_ranges(session, Checklist.id, chunk_size):
+        in_range = _in_range(Checklist.id, lower, upper)
+        counters += session.execute(_recount_update(in_range)).rowcount
+        checklists += session.execute(
+            _checklist_status_update(in_range, only_changed=True)
+        ).rowcount
+        session.commit()
+
+    for lower, upper in _pk_ranges(session, Application.id, chunk_size):
+        for stmt in _app_status_updates(
+            lambda column: _in_range(column, lower, upper), only_changed=True
+        ):
+            apps += session.execute(
+                stmt.execution_options(synchronize_session=False)
+            ).rowcount
+        session.commit()
+
+    return {
+        "counters_repaired": counters,
+        "checklists_changed": checklists,
+        "applications_changed": apps,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def collect_dirty_apps(session: Session, flush_context):
+    """Applications whose checklists were added, removed or changed status."""
+    app_ids = set()
+    for obj in session.new | session.deleted:
+        if isinstance(obj, Checklist):
+            app_ids.add(obj.app_id)
+    for obj in session.dirty:
+        if isinstance(obj, Checklist):
+            state = inspect(obj)
+            if any(state.attrs[name].history.has_changes() for name in _APP_INPUTS):
+                app_ids.add(obj.app_id)
+                app_ids.update(state.attrs.app_id.history.deleted or ())
+    mark_apps_dirty(session, app_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def run_rollup(session: Session):
+    # Flush first so pending checklist changes are seen by after_flush
+    session.flush()
+    checklist_ids = session.info.pop(DIRTY_CHECKLISTS, set())
+    app_ids = session.info.pop(DIRTY_APPS, set())
+    if checklist_ids:
+        app_ids |= rollup_checklists(session, checklist_ids)
+    if app_ids:
+        rollup_apps(session, app_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_dirty(session: Session, previous_transaction):
+    session.info.pop(DIRTY_CHECKLISTS, None)
+    session.info.pop(DIRTY_APPS, None)
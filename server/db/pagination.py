@@ -0,0 +1,147 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Literal, NamedTuple, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import Row, Select, and_, asc, desc, func, or_, select
+from sqlalchemy.orm import Session
+
+SortOrder = Literal["asc", "desc"]
+SORT_KEY_PREFIX = "_sort_key_"
+TOTAL_COUNT_LABEL = "_total_count"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != size:
+            raise ValueError("cursor does not match the sort keys")
+        return [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def _keyset_predicate(keys: list[tuple[Any, SortOrder]], values: list[Any]):
+    """
+    Rows strictly after `values` in (k1, k2, ..., kn) order:
+    k1 > v1 OR (k1 = v1 AND k2 > v2) OR ... with < for descending keys.
+    """
+    clauses = []
+    for i, (expr, order) in enumerate(keys):
+        after = expr < values[i] if order == "desc" else expr > values[i]
+        equal_prefix = [keys[j][0] == values[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
+
+
+def paginate(
+    stmt: Select,
+    keys: list[tuple[Any, SortOrder]],
+    page: int,
+    page_size: int,
+    cursor: str | None = None,
+) -> Select:
+    """
+    Order `stmt` by `keys` and apply either LIMIT/OFFSET (`page`) or keyset
+    pagination (`cursor`).
+
+    The last key must be unique (the primary key) so the order is total. The
+    sort keys are added to the select list so the next cursor can be built
+    from the last row, which also satisfies DISTINCT + ORDER BY on MySQL.
+
+    Cursor mode is opt-in: `cursor=""` asks for the first page, a value
+    returned as `next_cursor` asks for the page after it. It fetches one
+    extra row to know whether a next page exists; see `split_page`.
+    """
+    stmt = stmt.add_columns(
+        *(expr.label(f"{SORT_KEY_PREFIX}{i}") for i, (expr, _) in enumerate(keys))
+    ).order_by(
+        *(desc(expr) if order == "desc" else asc(expr) for expr, order in keys)
+    )
+
+    if cursor is not None:
+        if cursor:
+            values = decode_cursor(cursor, len(keys))
+            stmt = stmt.where(_keyset_predicate(keys, values))
+        return stmt.limit(page_size + 1)
+
+    if page >= 1:
+        return stmt.limit(page_size).offset(page * page_size - page_size)
+    return stmt
+
+
+def split_page(
+    rows: Sequence[Row], page_size: int, cursor: str | None = None
+) -> tuple[Sequence[Row], str | None]:
+    """Trim the look-ahead row of a keyset page and build `next_cursor`."""
+    if cursor is None or len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]._mapping
+    values = []
+    i = 0
+    while f"{SORT_KEY_PREFIX}{i}" in last:
+        values.append(last[f"{SORT_KEY_PREFIX}{i}"])
+        i += 1
+    return rows, encode_cursor(values)
+
+
+class Page(NamedTuple):
+    rows: Sequence[Row]
+    total_count: int | None
+    next_cursor: str | None
+
+
+def fetch_page(
+    db: Session,
+    stmt: Select,
+    keys: list[tuple[Any, SortOrder]],
+    page: int,
+    page_size: int,
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> Page:
+    """
+    Run a paginated list query and return the page with its total count.
+
+    The total comes from `COUNT(*) OVER()` on the page query itself, so a
+    list call is one round trip instead of a COUNT over the same joins plus
+    the page. `stmt` must not use DISTINCT, since the window is evaluated
+    before it. Only a keyset page past the first, or an offset past the last
+    row, needs a separate COUNT. `include_total=False` skips counting for
+    infinite-scroll clients.
+    """
+    windowed = include_total and not cursor
+    paged = paginate(stmt, keys, page, page_size, cursor)
+    if windowed:
+        paged = paged.add_columns(func.count().over().label(TOTAL_COUNT_LABEL))
+
+    rows = db.execute(paged).all()
+
+    total_count = None
+    if windowed and rows:
+        total_count = rows[0]._mapping[TOTAL_COUNT_LABEL]
+    elif windowed and (cursor is not None or page <= 1):
+        total_count = 0
+    elif include_total:
+        total_count = db.scalar(select(func.count()).select_from(stmt.subquery()))
+
+    rows, next_cursor = split_page(rows, page_size, cursor)
+    return Page(rows, total_count, next_cursor)
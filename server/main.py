@@ -1,3 +1,5 @@
+import secrets
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -5,22 +7,40 @@ from fastapi import Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
-
-from controllers.user_responses_controller import UPLOAD_DIR
-from db.connection import init_db
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from db.connection import (
+    dispose_engine,
+    get_async_engine,
+    get_engine,
+    init_db,
+    init_engine,
+)
 
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
+from services.extensions import query_stats
+from services.extensions.config import Config as MetricsConfig
+from services.extensions.metrics import (
+    RATE_LIMIT_REJECTIONS,
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    route_template,
+)
 from services.extensions.rate_limiter import limiter
+from services.jobs import runner as jobs
+from services.previews import worker as previews
+from services.storage.backends import get_local_storage
 
-# from db.events import checklist_complete_update
+from db.events import status_rollup  # noqa: F401  registers the status listeners
 from routes import (
     application_routes,
     assignment_routes,
     auth_routes,
     checklists_routes,
     control_routes,
+    job_routes,
     pre_assess_draft_routes,
     responses_routes,
     pre_assessment_routes,
@@ -30,21 +50,32 @@ from routes import (
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await init_engine()
+    query_stats.instrument(get_engine())
+    query_stats.instrument(get_async_engine())
     init_db()
+    await jobs.start()
+    previews.start()
     yield
+    await previews.stop()
+    await jobs.stop()
+    await dispose_engine()
 
 
 app = FastAPI(lifespan=lifespan, root_path="/api/v1.0")
 
 app.state.limiter = limiter
 
-app.add_exception_handler(
-    RateLimitExceeded,
-    lambda request, exc: JSONResponse(
+
+def rate_limit_exceeded(request: Request, exc: RateLimitExceeded):
+    RATE_LIMIT_REJECTIONS.labels(route_template(request)).inc()
+    return JSONResponse(
         status_code=429,
         content={"detail": "Rate limit exceeded. Try again after sometime."},
-    ),
-)
+    )
+
+
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded)
 app.add_middleware(SlowAPIMiddleware)
 
 app.add_middleware(
@@ -62,6 +93,40 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def request_metrics(request: Request, call_next):
+    in_flight = REQUESTS_IN_FLIGHT.labels(request.method)
+    in_flight.inc()
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        in_flight.dec()
+        # The route is only known once the router has matched the request
+        REQUEST_LATENCY.labels(
+            request.method, route_template(request), str(status_code)
+        ).observe(time.perf_counter() - started)
+
+
+@app.middleware("http")
+async def db_query_stats(request: Request, call_next):
+    with query_stats.track() as stats:
+        response = await call_next(request)
+
+    db_ms = stats.duration * 1000
+    response.headers["X-DB-Queries"] = str(stats.count)
+    server_timing = f'db;dur={db_ms:.1f};desc="{stats.count} queries"'
+    if "server-timing" in response.headers:
+        server_timing = f"{response.headers['server-timing']}, {server_timing}"
+    response.headers["Server-Timing"] = server_timing
+
+    query_stats.log_repeated_queries(request.method, request.url.path, stats)
+    return response
+
+
 @app.middleware("http")
 async def remove_server_header(request: Request, call_next):
     response = await call_next(request)
@@ -101,7 +166,7 @@ async def add_csp_header(request, call_next):
     return response
 
 
-app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
+app.mount("/uploads", StaticFiles(directory=get_local_storage().root), name="uploads")
 
 
 @app.get("/health")
@@ -109,6 +174,19 @@ async def health_check(request: Request):
     return {"msg": "I'm alive", "status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus metrics, for a scraper holding METRICS_TOKEN only."""
+    token = MetricsConfig.METRICS_TOKEN
+    if not token:
+        return Response(status_code=404)
+    expected = f"Bearer {token}".encode()
+    sent = request.headers.get("authorization", "").encode()
+    if not secrets.compare_digest(sent, expected):
+        return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 app.include_router(auth_routes.router)
 app.include_router(application_routes.router)
 app.include_router(checklists_routes.router)
@@ -118,3 +196,4 @@ app.include_router(responses_routes.router)
 app.include_router(pre_assessment_routes.router)
 app.include_router(pre_assess_draft_routes.router)
 app.include_router(admin_inspect_routes.router)
+app.include_router(job_routes.router)
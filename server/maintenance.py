@@ -0,0 +1,86 @@
+"""
+Maintenance commands, run from the server directory:
+
+    uv run python maintenance.py recount
+    uv run python maintenance.py recompute-statuses [--chunk-size N]
+    uv run python maintenance.py prune-evidence [--min-age-hours N]
+"""
+
+import argparse
+from datetime import timedelta
+
+from db.connection import create_session_factory
+from controllers.checklist_controller import repair_checklist_counts
+from controllers.evidence_controller import prune_evidence_blobs
+from db.events.status_rollup import recompute_all
+
+
+def recount(args: argparse.Namespace):
+    SessionLocal = create_session_factory()
+    with SessionLocal() as db:
+        repaired = repair_checklist_counts(db)
+    print(
+        f"Repaired control/response counts on {repaired} checklists "
+        "and recomputed their statuses"
+    )
+
+
+def recompute_statuses(args: argparse.Namespace):
+    SessionLocal = create_session_factory()
+    with SessionLocal() as db:
+        report = recompute_all(db, chunk_size=args.chunk_size)
+    print(
+        f"Recomputed statuses in {report['elapsed_seconds']}s: "
+        f"{report['counters_repaired']} counters repaired, "
+        f"{report['checklists_changed']} checklists and "
+        f"{report['applications_changed']} applications changed"
+    )
+
+
+def prune_evidence(args: argparse.Namespace):
+    SessionLocal = create_session_factory()
+    with SessionLocal() as db:
+        pruned = prune_evidence_blobs(db, min_age=timedelta(hours=args.min_age_hours))
+    print(f"Deleted {pruned} unreferenced evidence blobs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Security assessment maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    recount_parser = commands.add_parser(
+        "recount",
+        help="Recompute checklist controls_count/responses_count and their statuses",
+    )
+    recount_parser.set_defaults(func=recount)
+
+    recompute_parser = commands.add_parser(
+        "recompute-statuses",
+        help="Recompute every checklist and application status",
+    )
+    recompute_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=5000,
+        help="Rows per primary-key range; each range is its own transaction",
+    )
+    recompute_parser.set_defaults(func=recompute_statuses)
+
+    prune_parser = commands.add_parser(
+        "prune-evidence",
+        help="Delete evidence blobs no response uses any more",
+    )
+    prune_parser.add_argument(
+        "--min-age-hours",
+        type=int,
+        default=24,
+        help="Keep blobs stored more recently, in case a response is being saved",
+    )
+    prune_parser.set_defaults(func=prune_evidence)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ from .core.controls import Control
 from .core.user_responses import UserResponse
 from .core.checklist_assignments import ChecklistAssignment
 from .core.user_priorities import UserPriority
+from .core.jobs import Job
+from .core.evidence_blobs import EvidenceBlob, EvidenceReference
 
 from .pre_assessment.sections import Section
 from .pre_assessment.answers import Answer
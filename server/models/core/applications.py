@@ -1,8 +1,7 @@
-from sqlalchemy import ForeignKey, String, Text, select, and_
+from sqlalchemy import ForeignKey, Index, String, Text, select, and_
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .user_priorities import UserPriority
 from sqlalchemy.orm import Session
-from fastapi import HTTPException, status
 
 from db.base import Base, BaseMixin
 
@@ -38,6 +37,10 @@ class Application(Base, BaseMixin):
     )
     checklists = relationship("Checklist", back_populates="app")
 
+    __table_args__ = (
+        Index("ix_applications_active_created", "is_active", "created_at", "id"),
+    )
+
     def get_priority_for_user(self, user_id: str, db: Session) -> int:
         user_priority = (
             db.query(UserPriority)
@@ -68,20 +71,8 @@ class Application(Base, BaseMixin):
                 priority=priority_val,
             )
             db.add(priority)
-        try:
-            db.commit()
-        except HTTPException:
-            raise
-        except Exception as e:
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error setting the priority {str(e)}",
-            )
-
-    def refresh_completion_status(self):
-        """Recalculate is_completed based on checklists."""
-        self.is_completed = all(c.is_completed for c in self.checklists)
+        # Committed by the caller together with the rest of the request
+        db.flush()
 
     def __repr__(self) -> str:
         return f"<app_id={self.id}, app_name={self.name}>"
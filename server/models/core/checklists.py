@@ -1,7 +1,6 @@
-from sqlalchemy import ForeignKey, String, Text, select, and_
+from sqlalchemy import ForeignKey, Index, Integer, String, Text, select, and_
 from sqlalchemy.orm import Mapped, mapped_column, relationship, Session
 from .user_priorities import UserPriority
-from fastapi import HTTPException, status
 
 from db.base import Base, BaseMixin
 
@@ -15,6 +14,12 @@ class Checklist(Base, BaseMixin):
     is_completed: Mapped[bool] = mapped_column(default=False)
     status: Mapped[str] = mapped_column(String(40), default="pending")
     comment: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Denormalised counts kept in step with inserts/deletes of controls and
+    # responses, see `db.events.status_rollup.adjust_counts`. Repair with `maintenance.py recount`.
+    controls_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    responses_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0"
+    )
     # ----------------Relationships------------
     app = relationship("Application", back_populates="checklists")
     controls = relationship(
@@ -27,6 +32,12 @@ class Checklist(Base, BaseMixin):
         "ChecklistAssignment", back_populates="checklist", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index(
+            "ix_checklists_app_active_created", "app_id", "is_active", "created_at", "id"
+        ),
+    )
+
     def get_priority_for_user(self, user_id: str, db: Session) -> int:
         user_priority = (
             db.query(UserPriority)
@@ -56,16 +67,9 @@ class Checklist(Base, BaseMixin):
                 priority=priority_val,
             )
             db.add(priority)
-        try:
-            db.commit()
-        except HTTPException:
-            raise
-        except Exception as e:
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error setting the priority {str(e)}",
-            )
+        # Committed by the caller together with the rest of the request
+        db.flush()
 
     def __repr__(self) -> str:
         return f"<checklist_id={self.id}, checklist_type={self.checklist_type}>"
+
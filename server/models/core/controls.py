@@ -23,7 +23,10 @@ class Control(Base, BaseMixin):
         uselist=False,
     )
 
-    __table_args__ = (Index("ix_controls_checklist_id", "checklist_id"),)
+    __table_args__ = (
+        Index("ix_controls_checklist_id", "checklist_id"),
+        Index("ix_controls_checklist_created", "checklist_id", "created_at", "id"),
+    )
 
     def __repr__(self) -> str:
         return f"<control_id={self.id}, checklist_id={self.checklist_id}, control_area={self.control_area}>"
@@ -0,0 +1,49 @@
+from sqlalchemy import BigInteger, ForeignKey, Index, String
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from db.base import Base, BaseMixin
+
+
+class EvidenceBlob(Base, BaseMixin):
+    """An evidence file stored once under a key derived from its SHA-256."""
+
+    __tablename__ = "evidence_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    content_type: Mapped[str] = mapped_column(String(255), nullable=True)
+    storage_path: Mapped[str] = mapped_column(MEDIUMTEXT, nullable=False)
+
+    references = relationship("EvidenceReference", back_populates="blob")
+
+    __table_args__ = (Index("uq_evidence_blobs_sha256", "sha256", unique=True),)
+
+    def __repr__(self) -> str:
+        return f"<blob_id={self.id}, sha256={self.sha256}>"
+
+
+class EvidenceReference(Base, BaseMixin):
+    """A response using a blob as its evidence, under the name it was uploaded as."""
+
+    __tablename__ = "evidence_references"
+
+    response_id: Mapped[str] = mapped_column(
+        String(40), ForeignKey("user_responses.id", ondelete="CASCADE"), nullable=False
+    )
+    blob_id: Mapped[str] = mapped_column(
+        String(40), ForeignKey("evidence_blobs.id"), nullable=False
+    )
+    file_name: Mapped[str] = mapped_column(String(255), nullable=True)
+
+    response = relationship("UserResponse", back_populates="evidence_reference")
+    blob = relationship("EvidenceBlob", back_populates="references")
+
+    __table_args__ = (
+        # A response has one evidence file
+        Index("uq_evidence_references_response", "response_id", unique=True),
+        Index("ix_evidence_references_blob_id", "blob_id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<response_id={self.response_id}, blob_id={self.blob_id}>"
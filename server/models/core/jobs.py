@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base, BaseMixin
+
+
+class Job(Base, BaseMixin):
+    """A background import and its progress, polled through GET /jobs/{id}."""
+
+    __tablename__ = "jobs"
+
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    # queued -> running -> succeeded | failed
+    status: Mapped[str] = mapped_column(String(20), default="queued", nullable=False)
+    user_id: Mapped[str] = mapped_column(
+        String(40), ForeignKey("users.id"), nullable=False
+    )
+    checklist_id: Mapped[str] = mapped_column(
+        String(40), ForeignKey("checklists.id"), nullable=True
+    )
+    file_name: Mapped[str] = mapped_column(String(255), nullable=True)
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    rows_failed: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    result: Mapped[Any] = mapped_column(JSON, nullable=True)
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    # The worker process holding the job in its queue, and when it last
+    # said it was alive; a queued or running job with a stale heartbeat
+    # belongs to a process that is gone
+    owner: Mapped[str] = mapped_column(String(80), nullable=True)
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_user_created", "user_id", "created_at"),
+        Index("ix_jobs_status", "status"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<job_id={self.id}, kind={self.kind}, status={self.status}>"
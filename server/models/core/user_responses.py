@@ -18,11 +18,19 @@ class UserResponse(Base, BaseMixin):
     control = relationship("Control", back_populates="responses", uselist=False)
     checklist = relationship("Checklist", back_populates="responses")
     user = relationship("User", back_populates="responses")
+    evidence_reference = relationship(
+        "EvidenceReference",
+        back_populates="response",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
     __table_args__ = (
         Index("ix_user_responses_user_id", "user_id"),
         Index("ix_user_responses_control_id", "control_id"),
         Index("ix_user_responses_checklist_id", "checklist_id"),
+        # Upsert key for bulk uploads
+        Index("uq_user_responses_control_user", "control_id", "user_id", unique=True),
     )
 
     def __repr__(self) -> str:
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.base import Base, BaseMixin
@@ -25,3 +25,8 @@ class Submission(Base, BaseMixin):
     assessed_person = relationship(
         "User", back_populates="assessed_submissions", foreign_keys=[assessed_by]
     )
+
+    __table_args__ = (
+        Index("ix_submissions_created", "created_at", "id"),
+        Index("ix_submissions_user_created", "user_id", "created_at", "id"),
+    )
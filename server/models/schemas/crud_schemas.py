@@ -192,6 +192,42 @@ class UserResponseUpdate(BaseModel):
     evidence_path: str | None = None
 
 
+class EvidenceUploadCreate(BaseModel):
+    file_name: str
+    content_type: str
+    # Declared by the client; the upload policy enforces the real limit
+    size: int | None = None
+
+
+class EvidenceUploadOut(BaseModel):
+    url: str
+    fields: dict[str, str]
+    file_key: str
+    max_size: int
+    expires_in: int
+
+
+class EvidenceUploadFinalize(BaseModel):
+    file_key: str
+    # Used when the control has no response from the user yet
+    current_setting: str | None = None
+    review_comment: str | None = None
+
+
+class EvidenceUrlOut(BaseModel):
+    response_id: str
+    control_id: str
+    user_id: str
+    evidence_path: str
+    url: str
+    expires_at: datetime
+
+
+class EvidenceUrlsOut(BaseModel):
+    checklist_id: str
+    urls: list[EvidenceUrlOut] = []
+
+
 class UserResponseOut(BaseModel):
     id: str
     control_id: str
@@ -241,6 +277,7 @@ class ControlWithResponseOutNonList(BaseModel):
 class ControlWithResponseOut(BaseModel):
     list_controls: list[ControlWithResponseOutNonList] = []
     total_counts: TotalsCount
+    next_cursor: str | None = None
 
 
 class ControlsWithChecklist(BaseModel):
@@ -254,3 +291,23 @@ class ImportControlsRequest(BaseModel):
 
 class PriorityVal(BaseModel):
     priority_val: Literal[1, 2, 3]
+
+
+class JobOut(BaseModel):
+    id: str
+    kind: str
+    status: str
+    checklist_id: str | None = None
+    file_name: str | None = None
+    rows_processed: int = 0
+    rows_failed: int = 0
+    # Rows per second since the job started
+    throughput: float | None = None
+    result: dict | None = None
+    error: str | None = None
+
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -17,6 +17,12 @@ class AppQueryParams(BaseModel):
     ] = Field("name", description="The field you want to search by")
     page: int = 1
     page_size: int = 15
+    cursor: str | None = Field(
+        None, description="Keyset cursor; pass an empty string for the first page"
+    )
+    include_total: bool = Field(
+        True, description="Set false to skip counting the total rows"
+    )
 
     @field_validator("sort_by")
     @classmethod
@@ -37,6 +43,12 @@ class ChecklistQueryParams(BaseModel):
     )
     page: int
     page_size: int
+    cursor: str | None = Field(
+        None, description="Keyset cursor; pass an empty string for the first page"
+    )
+    include_total: bool = Field(
+        True, description="Set false to skip counting the total rows"
+    )
 
     @field_validator("sort_by")
     @classmethod
@@ -53,6 +65,12 @@ class ControlsResponsesQueryParams(BaseModel):
 
     page: int
     page_size: int
+    cursor: str | None = Field(
+        None, description="Keyset cursor; pass an empty string for the first page"
+    )
+    include_total: bool = Field(
+        True, description="Set false to skip counting the total rows"
+    )
 
     @field_validator("sort_by")
     @classmethod
@@ -72,6 +90,12 @@ class PreAssessmentParams(BaseModel):
 
     page: int = 1
     page_size: int = 15
+    cursor: str | None = Field(
+        None, description="Keyset cursor; pass an empty string for the first page"
+    )
+    include_total: bool = Field(
+        True, description="Set false to skip counting the total rows"
+    )
 
     @field_validator("sort_by")
     @classmethod
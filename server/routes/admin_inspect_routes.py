@@ -1,5 +1,5 @@
-from controllers.admin_inspect import get_subs_n_apps
-from fastapi import APIRouter, Depends, HTTPException, status
+from controllers.admin_inspect import get_subs_n_apps, recompute_statuses
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from models.schemas.crud_schemas import UserOut
 from typing import Annotated
 from sqlalchemy.orm import Session
@@ -20,3 +20,21 @@ async def fetch_submissions_and_applications(
         )
     results = get_subs_n_apps(db)
     return results
+
+
+# Sync: the recompute blocks for seconds, so it runs in the threadpool
+@router.post("/recompute-statuses")
+def recompute_all_statuses(
+    db: Annotated[Session, Depends(get_db_conn)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+    chunk_size: Annotated[int, Query(ge=100, le=50000)] = 5000,
+):
+    """
+    Recount checklist controls/responses and recompute every checklist and
+    application status. Reports rows changed and elapsed time.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized"
+        )
+    return recompute_statuses(db, chunk_size=chunk_size)
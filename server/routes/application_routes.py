@@ -2,20 +2,22 @@ from typing import Annotated, Any, Literal
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, status, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import Application
 
 from controllers.application_controller import (
     create_app,
     delete_app,
-    list_apps_with_details,
+    list_apps_with_details_async,
     restore_app,
     update_app,
     get_trashed_apps,
     get_app_stats,
-    list_apps,
+    list_apps_async,
     get_app_details,
 )
-from db.connection import get_db_conn
+from controllers.export_controller import export_application
+from db.connection import get_async_db_conn, get_db_conn
 from models.schemas.crud_schemas import (
     ApplicationCreate,
     ApplicationOut,
@@ -44,7 +46,7 @@ async def create_application(
 
 @router.get("")
 async def get_apps(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_db_conn)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     sort_by: Annotated[str, Query()] = "created_at",
     sort_order: Annotated[Literal["asc", "desc"], Query()] = "desc",
@@ -63,6 +65,8 @@ async def get_apps(
         ],
         Query(),
     ] = "name",
+    cursor: Annotated[str | None, Query()] = None,
+    include_total: Annotated[bool, Query()] = True,
 ):
     params = AppQueryParams(
         sort_by=sort_by,
@@ -71,8 +75,10 @@ async def get_apps(
         page=page,
         page_size=page_size,
         search_by=search_by,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return list_apps(
+    return await list_apps_async(
         db=db,
         user=current_user,
         params=params,
@@ -81,7 +87,7 @@ async def get_apps(
 
 @router.get("/with_details")
 async def get_applications_with_routes(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_db_conn)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     sort_by: Annotated[str, Query()] = "created_at",
     sort_order: Annotated[Literal["asc", "desc"], Query()] = "desc",
@@ -100,6 +106,8 @@ async def get_applications_with_routes(
         ],
         Query(),
     ] = "name",
+    cursor: Annotated[str | None, Query()] = None,
+    include_total: Annotated[bool, Query()] = True,
 ):
     params = AppQueryParams(
         sort_by=sort_by,
@@ -108,8 +116,10 @@ async def get_applications_with_routes(
         page=page,
         page_size=page_size,
         search_by=search_by,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return list_apps_with_details(db=db, user=current_user, params=params)
+    return await list_apps_with_details_async(db=db, user=current_user, params=params)
 
 
 @router.get("/{app_id}", response_model=ApplicationOut)
@@ -173,7 +183,7 @@ async def get_apps_in_trash(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"You are not authorised {current_user.username}",
         )
-    return get_trashed_apps(db=db)
+    return get_trashed_apps(db=db, user=current_user)
 
 
 @router.get("/stats")
@@ -213,3 +223,16 @@ def set_app_priority(
     app.set_priority_for_user(
         user_id=current_user.id, db=db, priority_val=priority_val.priority_val
     )
+    db.commit()
+
+
+@router.get("/{app_id}/export")
+def export_application_pack(
+    app_id: Annotated[str, Path(title="App Id of the app to export")],
+    db: Annotated[Session, Depends(get_db_conn)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+    format: Annotated[Literal["csv", "xlsx"], Query()] = "csv",
+):
+    return export_application(
+        app_id=app_id, db=db, current_user=current_user, file_format=format
+    )
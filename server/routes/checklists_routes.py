@@ -2,16 +2,17 @@ from typing import Annotated, Literal, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Path, status, Query, Body
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from controllers.checklist_controller import (
     update_checklist_status,
     create_checklist,
-    get_checklists_for_app,
+    get_checklists_for_app_async,
     remove_checklist,
     update_checklist,
     get_trash_checklists,
 )
-from db.connection import get_db_conn
+from db.connection import get_async_db_conn, get_db_conn
 from models.schemas.crud_schemas import (
     ChecklistCreate,
     ChecklistOut,
@@ -40,7 +41,7 @@ async def create_new_checklist(
 @router.get("/applications/{app_id}/checklists")
 async def get_app_checklists(
     app_id: str,
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_db_conn)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     sort_by: Annotated[str, Query()] = "created_at",
     sort_order: Annotated[Literal["asc", "desc"], Query()] = "desc",
@@ -51,6 +52,8 @@ async def get_app_checklists(
         Literal["checklist_type", "priority", "is_completed"],
         Query(),
     ] = "checklist_type",
+    cursor: Annotated[str | None, Query()] = None,
+    include_total: Annotated[bool, Query()] = True,
 ) -> dict[str, Any]:
     params = ChecklistQueryParams(
         sort_by=sort_by,
@@ -59,8 +62,10 @@ async def get_app_checklists(
         search=search,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return get_checklists_for_app(
+    return await get_checklists_for_app_async(
         app_id=app_id, db=db, user=current_user, params=params
     )
 
@@ -165,4 +170,6 @@ def set_app_priority(
     checklist.set_priority_for_user(
         user_id=current_user.id, db=db, priority_val=priority_val.priority_val
     )
-    return ChecklistOut.model_validate(checklist)
+    result = ChecklistOut.model_validate(checklist)
+    db.commit()
+    return result
@@ -11,18 +11,20 @@ from fastapi import (
     Query,
 )
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from controllers.controls_controller import (
     add_controls,
     get_controls,
-    get_controls_with_responses,
+    get_controls_with_responses_async,
     remove_controls,
     update_control,
     import_controls,
     add_controls_from_file,
     export_controls_csv,
+    export_controls_xlsx,
 )
-from db.connection import get_db_conn
+from db.connection import get_async_db_conn, get_db_conn
 from models.schemas.crud_schemas import (
     ControlCreate,
     ControlOut,
@@ -33,6 +35,7 @@ from models.schemas.crud_schemas import (
     ImportControlsRequest,
 )
 from services.auth.deps import get_current_user
+from services.jobs import runner as jobs
 from models import Checklist
 from models.schemas.params import ControlsResponsesQueryParams
 
@@ -68,19 +71,26 @@ async def fetch_controls(
 @router.get("/checklists/{checklist_id}/controls-responses")
 async def fetch_controls_with_responses(
     checklist_id: Annotated[str, Path(title="Checklist Id")],
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_db_conn)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     sort_by: Annotated[str, Query()] = "created_at",
     sort_order: Annotated[Literal["asc", "desc"], Query()] = "desc",
     page: Annotated[int, Query()] = 1,
     page_size: Annotated[int, Query()] = 10,
+    cursor: Annotated[str | None, Query()] = None,
+    include_total: Annotated[bool, Query()] = True,
 ) -> Annotated[
     ControlWithResponseOut | list, "Function to create a control and output it"
 ]:
     params = ControlsResponsesQueryParams(
-        sort_by=sort_by, sort_order=sort_order, page=page, page_size=page_size
+        sort_by=sort_by,
+        sort_order=sort_order,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return get_controls_with_responses(
+    return await get_controls_with_responses_async(
         checklist_id=checklist_id, db=db, current_user=current_user, params=params
     )
 
@@ -133,8 +143,12 @@ async def importing_controls(
     )
 
 
-@router.post("/checklists/{checklist_id}/controls/upload")
-async def upload_controls_file(
+# Sync so copying the upload to the job's temp file runs in the threadpool
+@router.post(
+    "/checklists/{checklist_id}/controls/upload",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def upload_controls_file(
     checklist_id: Annotated[
         str,
         Path(...),
@@ -156,17 +170,27 @@ async def upload_controls_file(
         )
     checklist = db.get(Checklist, checklist_id)
     if not checklist:
-        print(f"Checklist with ID {checklist_id} not found.")
-        return
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Checklist Not found {checklist_id}",
+        )
     try:
-        content = await input_file.read()
         if input_file.filename is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Uploaded file must have a filename",
             )
-        result = add_controls_from_file(content, input_file.filename, checklist_id, db)
-        return result
+        # Parsed and inserted by a job worker; poll GET /jobs/{job_id}
+        job = jobs.submit_import(
+            db,
+            kind="controls_upload",
+            target=add_controls_from_file,
+            upload=input_file.file,
+            file_name=input_file.filename,
+            user_id=current_user.id,
+            checklist_id=checklist_id,
+        )
+        return {"job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}"}
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -178,7 +202,12 @@ async def export_conrols_as_csv(
     checklist_id: Annotated[str, Path(title="Checklist Id")],
     db: Annotated[Session, Depends(get_db_conn)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
+    format: Annotated[Literal["csv", "xlsx"], Query()] = "csv",
 ):
+    if format == "xlsx":
+        return export_controls_xlsx(
+            checklist_id=checklist_id, db=db, current_user=current_user
+        )
     return export_controls_csv(
         checklist_id=checklist_id, db=db, current_user=current_user
     )
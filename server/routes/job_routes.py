@@ -0,0 +1,20 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Path
+from sqlalchemy.orm import Session
+
+from controllers.job_controller import get_job
+from db.connection import get_db_conn
+from models.schemas.crud_schemas import JobOut, UserOut
+from services.auth.deps import get_current_user
+
+router = APIRouter(tags=["jobs"])
+
+
+@router.get("/jobs/{job_id}")
+async def fetch_job(
+    job_id: Annotated[str, Path(title="Job Id")],
+    db: Annotated[Session, Depends(get_db_conn)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+) -> Annotated[JobOut, "Progress of a background import"]:
+    return get_job(job_id=job_id, db=db, current_user=current_user)
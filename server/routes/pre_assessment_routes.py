@@ -174,9 +174,16 @@ async def get_submissions(
     search: Annotated[
         str | None, Query(description="Search string to be searched")
     ] = None,
+    cursor: Annotated[str | None, Query()] = None,
+    include_total: Annotated[bool, Query()] = True,
 ):
     params = PreAssessmentParams(
-        search=search, page=page, sort_by="created_at", sort_order="desc"
+        search=search,
+        page=page,
+        sort_by="created_at",
+        sort_order="desc",
+        cursor=cursor,
+        include_total=include_total,
     )
     if current_user.role == "admin":
         return get_assessment_submissions_for_admin(
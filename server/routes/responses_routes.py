@@ -1,6 +1,4 @@
-import os
 from typing import Annotated
-from uuid import uuid4
 
 from fastapi import (
     APIRouter,
@@ -10,31 +8,44 @@ from fastapi import (
     HTTPException,
     Path,
     Request,
+    Response,
     UploadFile,
     status,
     Query
 )
-from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from controllers.user_responses_controller import (
-    UPLOAD_DIR,
     add_responses_from_csv,
-    add_user_response,
+    add_user_response_async,
+    cached_evidence_url,
+    cached_preview_url,
+    check_checklist_access,
+    check_evidence_access,
+    create_evidence_upload,
+    finalize_evidence_upload,
     save_uploaded_file,
     update_user_response,
-    get_s3_presigned_url,
+    evidence_path_for_key,
+    get_checklist_evidence_urls,
 )
 
-from db.connection import get_db_conn
-from models.core.user_responses import UserResponse
+from db.connection import get_async_db_conn, get_db_conn
 from models.schemas.crud_schemas import (
+    EvidenceUploadCreate,
+    EvidenceUploadFinalize,
+    EvidenceUploadOut,
+    EvidenceUrlsOut,
     UserOut,
     UserResponseCreate,
     UserResponseOut,
     UserResponseUpdate,
 )
 from services.auth.deps import get_current_user
+from services.jobs import runner as jobs
+from services.storage.url_cache import signed_urls
 from services.extensions.rate_limiter import limiter
 
 router = APIRouter(tags=["responses"])
@@ -47,17 +58,46 @@ async def create_user_response(
     current_setting: Annotated[str, Form(...)],
     review_comment: Annotated[str, Form(...)],
     control_id: Annotated[str, Path(title="Control Id to submit the response")],
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_db_conn)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     evidence_file: UploadFile | None = File(None),
 ) -> Annotated[UserResponseOut, "Func to add user responses"]:
-    eviddence_path = save_uploaded_file(evidence_file, current_user.id, control_id)
+    eviddence_path = await save_uploaded_file(evidence_file)
     payload = UserResponseCreate(
         current_setting=current_setting,
         review_comment=review_comment,
         evidence_path=eviddence_path,
     )
-    return add_user_response(
+    return await add_user_response_async(
+        payload=payload,
+        control_id=control_id,
+        db=db,
+        current_user=current_user,
+        evidence_name=evidence_file.filename if evidence_file else None,
+    )
+
+
+# Sync: signing and the finalize check call the storage backend
+@router.post("/controls/{control_id}/evidence/upload-url")
+def create_evidence_upload_url(
+    payload: EvidenceUploadCreate,
+    control_id: Annotated[str, Path(title="Control Id the evidence is for")],
+    db: Annotated[Session, Depends(get_db_conn)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+) -> Annotated[EvidenceUploadOut, "Presigned POST for a direct evidence upload"]:
+    return create_evidence_upload(
+        payload=payload, control_id=control_id, db=db, current_user=current_user
+    )
+
+
+@router.post("/controls/{control_id}/evidence/finalize")
+def finalize_evidence(
+    payload: EvidenceUploadFinalize,
+    control_id: Annotated[str, Path(title="Control Id the evidence is for")],
+    db: Annotated[Session, Depends(get_db_conn)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+) -> Annotated[UserResponseOut, "Response with the uploaded evidence"]:
+    return finalize_evidence_upload(
         payload=payload, control_id=control_id, db=db, current_user=current_user
     )
 
@@ -76,34 +116,32 @@ async def edit_user_response(
     remove_evidence: Annotated[bool, Form(...)] = False,
     evidence_file: UploadFile | None = File(None),
 ) -> Annotated[UserResponseOut, "Func to update user responses"]:
-    control_id = db.scalar(
-        select(UserResponse.control_id).where(UserResponse.id == response_id)
-    )
-    evidence_path = None
-    if not control_id:
-        control_id = f"{uuid4().hex}"
-    if evidence_file:
-        evidence_path = save_uploaded_file(evidence_file, current_user.id, control_id)
-    elif remove_evidence:
-        existing = db.scalar(select(UserResponse).where(UserResponse.id == response_id))
-        if existing and existing.evidence_path:
-            try:
-                os.remove(os.path.join(UPLOAD_DIR, existing.evidence_path))
-            except FileNotFoundError:
-                pass
-        evidence_path = None
     payload = UserResponseUpdate(
         current_setting=current_setting,
         review_comment=review_comment,
-        evidence_path=evidence_path if evidence_file else None,
     )
-    return update_user_response(
-        payload=payload, response_id=response_id, db=db, current_user=current_user
+    # The replaced or removed file is deleted by the controller, after its
+    # access check and once the update is committed
+    if evidence_file:
+        payload.evidence_path = await save_uploaded_file(evidence_file)
+    elif remove_evidence:
+        payload.evidence_path = None
+    return await run_in_threadpool(
+        update_user_response,
+        payload=payload,
+        response_id=response_id,
+        db=db,
+        current_user=current_user,
+        evidence_name=evidence_file.filename if evidence_file else None,
     )
 
 
-@router.post("/checklists/{checklist_id}/responses/upload")
-async def upload_controls_file(
+# Sync so copying the upload to the job's temp file runs in the threadpool
+@router.post(
+    "/checklists/{checklist_id}/responses/upload",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def upload_controls_file(
     checklist_id: Annotated[
         str,
         Path(...),
@@ -118,20 +156,24 @@ async def upload_controls_file(
             detail="Please Upload the file",
         )
     try:
-        content = await input_file.read()
         if input_file.filename is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Uploaded file must have a filename",
             )
-        result = add_responses_from_csv(
-            file_content=content,
+        check_checklist_access(checklist_id, db, current_user)
+        # Parsed and upserted by a job worker; poll GET /jobs/{job_id}
+        job = jobs.submit_import(
+            db,
+            kind="responses_upload",
+            target=add_responses_from_csv,
+            upload=input_file.file,
             file_name=input_file.filename,
-            current_user=current_user,
+            user_id=current_user.id,
             checklist_id=checklist_id,
-            db=db,
+            current_user=current_user,
         )
-        return result
+        return {"job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}"}
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -140,9 +182,42 @@ async def upload_controls_file(
 
 @router.get("/responses/file-view")
 async def view_file(
+    response: Response,
+    db: Annotated[Session, Depends(get_db_conn)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     file_key: Annotated[str, Query(description="S3 URL path")],
+    preview: Annotated[
+        bool, Query(description="Small WebP preview of an image, when there is one")
+    ] = False,
 ):
-    print(file_key)
-    url = get_s3_presigned_url(file_key=file_key, expires_in=3600)
-    return {"file_url": url}
+    path = evidence_path_for_key(file_key)
+    # Checked before the URL cache, which is per user but not per response
+    await run_in_threadpool(check_evidence_access, path, db, current_user)
+    hit = None
+    if preview:
+        # May check storage for the preview, so off the event loop
+        hit = await run_in_threadpool(cached_preview_url, path, current_user.id)
+    is_preview = hit is not None
+    url, expires_at = hit or cached_evidence_url(path, current_user.id)
+    # The browser can reuse the URL for as long as the server would, but
+    # should ask again for a preview that isn't ready yet
+    max_age = 0 if preview and not is_preview else signed_urls.max_age(expires_at)
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+    return {"file_url": url, "is_preview": is_preview}
+
+
+@router.get("/checklists/{checklist_id}/evidence-urls")
+def fetch_checklist_evidence_urls(
+    response: Response,
+    checklist_id: Annotated[str, Path(title="Checklist Id")],
+    db: Annotated[Session, Depends(get_db_conn)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+) -> Annotated[EvidenceUrlsOut, "View URLs for all evidence on a checklist"]:
+    result = get_checklist_evidence_urls(
+        checklist_id=checklist_id, db=db, current_user=current_user
+    )
+    if result.urls:
+        soonest = min(url.expires_at for url in result.urls).timestamp()
+        max_age = signed_urls.max_age(soonest)
+        response.headers["Cache-Control"] = f"private, max-age={max_age}"
+    return result
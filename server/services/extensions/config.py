@@ -0,0 +1,15 @@
+# services/extensions/config.py
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class MetricsConfig(BaseSettings):
+    # GET /metrics answers 404 until this is set, and then only to
+    # "Authorization: Bearer <METRICS_TOKEN>", the token Prometheus is
+    # configured with (scrape_config authorization.credentials)
+    METRICS_TOKEN: str | None = None
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+
+Config = MetricsConfig()
@@ -0,0 +1,125 @@
+# services/extensions/metrics.py
+
+import time
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.requests import Request
+from starlette.routing import Match
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being served",
+    ["method"],
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by the slowapi limiter",
+    ["route"],
+)
+S3_UPLOAD_DURATION = Histogram(
+    "s3_upload_duration_seconds",
+    "Time spent uploading evidence files to S3",
+    ["outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+EVIDENCE_UPLOADS = Counter(
+    "evidence_uploads_total",
+    "Evidence files by whether their content was already stored",
+    ["outcome"],
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled DB connection",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+
+
+def route_template(request: Request) -> str:
+    """
+    The matched route path (e.g. /applications/{app_id}) rather than the raw
+    URL, so label cardinality stays bounded.
+    """
+    route = request.scope.get("route")
+    if route is not None:
+        return route.path
+    # Not routed yet, e.g. rejected by a middleware
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL and hasattr(route, "path"):
+            return route.path
+    return "unmatched"
+
+
+class _TimedCheckout:
+    engine_label = ""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.engine_label).observe(
+                time.perf_counter() - started
+            )
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    engine_label = "sync"
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+class PoolCollector:
+    """Reads checked-out/overflow counts from the shared pools at scrape time."""
+
+    def _families(self):
+        return (
+            GaugeMetricFamily(
+                "db_pool_checked_out",
+                "Connections checked out of the pool",
+                labels=["engine"],
+            ),
+            GaugeMetricFamily(
+                "db_pool_overflow",
+                "Connections open beyond pool_size",
+                labels=["engine"],
+            ),
+            GaugeMetricFamily(
+                "db_pool_size", "Configured pool size", labels=["engine"]
+            ),
+        )
+
+    def describe(self):
+        # Lets the registry learn the metric names without calling collect(),
+        # which would import db.connection while it is still importing us.
+        return self._families()
+
+    def collect(self):
+        from db import connection
+
+        checked_out, overflow, size = self._families()
+        engines = {"sync": connection._engine}
+        if connection._async_engine is not None:
+            engines["async"] = connection._async_engine.sync_engine
+        for label, engine in engines.items():
+            if engine is None or not isinstance(engine.pool, QueuePool):
+                continue
+            checked_out.add_metric([label], engine.pool.checkedout())
+            overflow.add_metric([label], max(engine.pool.overflow(), 0))
+            size.add_metric([label], engine.pool.size())
+        yield checked_out
+        yield overflow
+        yield size
+
+
+REGISTRY.register(PoolCollector())
@@ -0,0 +1,91 @@
+# services/extensions/query_stats.py
+
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger("db.query_stats")
+
+# A statement shape executed this many times in one request is reported
+# as a likely N+1 (a lazy load or a query inside a loop).
+N_PLUS_ONE_THRESHOLD = 5
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0  # seconds
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list[tuple[str, int]]:
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+# The stats object is shared by reference, so queries run from the
+# threadpool or through AsyncSession.run_sync still land on the request.
+_current: ContextVar[QueryStats | None] = ContextVar("db_query_stats", default=None)
+
+
+# The start time lives on the statement's execution context rather than
+# the connection, so a statement that fails (and never reaches
+# after_cursor_execute) leaves nothing behind to pair with the next one.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.count += 1
+    started = getattr(context, "_query_start", None)
+    if started is not None:
+        stats.duration += time.perf_counter() - started
+    # Parameters are bound separately, so the SQL text is the statement shape.
+    # Chunked executemany batches repeat on purpose and aren't an N+1.
+    if not executemany:
+        stats.shapes[statement] += 1
+
+
+def instrument(engine: Engine | AsyncEngine) -> None:
+    """Count statements and DB time for `engine` against the current request."""
+    if isinstance(engine, AsyncEngine):
+        engine = engine.sync_engine
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track():
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def log_repeated_queries(method: str, path: str, stats: QueryStats) -> None:
+    for shape, n in stats.repeated():
+        logger.warning(
+            json.dumps(
+                {
+                    "event": "n_plus_one",
+                    "method": method,
+                    "path": path,
+                    "executions": n,
+                    "total_queries": stats.count,
+                    "statement": " ".join(shape.split())[:500],
+                }
+            )
+        )
@@ -0,0 +1,64 @@
+# services/imports/sheet_reader.py
+
+from collections.abc import Iterator
+from typing import BinaryIO
+
+import pandas as pd
+from openpyxl import load_workbook
+
+IMPORT_CHUNK_SIZE = 5000
+
+
+def normalise_columns(columns) -> list[str]:
+    return [
+        str(column).strip().lower().replace(" ", "_") if column is not None else ""
+        for column in columns
+    ]
+
+
+def _csv_chunks(file: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+    for chunk in pd.read_csv(file, dtype=str, chunksize=chunk_size):
+        chunk.columns = normalise_columns(chunk.columns)
+        chunk.index = chunk.index + 2  # header is row 1
+        yield chunk
+
+
+def _xlsx_chunks(file: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = normalise_columns(header)
+
+        values, numbers, yielded = [], [], False
+        for number, row in enumerate(rows, start=2):
+            if all(value is None for value in row):
+                continue
+            values.append(
+                [None if value is None else str(value) for value in row[: len(columns)]]
+            )
+            numbers.append(number)
+            if len(values) == chunk_size:
+                yield pd.DataFrame(values, columns=columns, index=numbers)
+                values, numbers, yielded = [], [], True
+        if values or not yielded:
+            yield pd.DataFrame(values, columns=columns, index=numbers)
+    finally:
+        workbook.close()
+
+
+def iter_sheet_chunks(
+    file: BinaryIO, file_name: str, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Read an uploaded CSV or XLSX file `chunk_size` rows at a time, straight
+    from the (spooled) upload file. Every chunk has normalised column names,
+    string values and the sheet row number as its index. A sheet without
+    data rows still yields one empty chunk so callers can check the header.
+    """
+    file.seek(0)
+    if file_name.lower().endswith(".csv"):
+        return _csv_chunks(file, chunk_size)
+    return _xlsx_chunks(file, chunk_size)
@@ -0,0 +1,217 @@
+# services/jobs/runner.py
+
+import asyncio
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Callable
+
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from db.connection import create_session_factory
+from models.core.jobs import Job
+
+logger = logging.getLogger("jobs")
+
+# Imports running at once per worker process. Each one holds a DB
+# connection for its whole transaction, so keep this well under POOL_SIZE.
+JOB_WORKERS = 2
+ACTIVE_STATUSES = ("queued", "running")
+# Seconds between heartbeats of this process's jobs, and how long a job
+# may go without one before it is taken to be orphaned
+JOB_HEARTBEAT_INTERVAL = 30
+JOB_STALE_AFTER = 120
+
+# Unique per process start: pids repeat across hosts, containers and restarts
+OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_queue: asyncio.Queue | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+_workers: list[asyncio.Task] = []
+# Counts of this process's running imports. The import holds its write
+# transaction until it ends (on SQLite, a lock on the whole database), so
+# progress is not written per chunk: GET /jobs/{id} reads it from here and
+# the jobs row gets it with each heartbeat and when the import ends.
+_progress: dict[str, dict[str, int]] = {}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _update_job(job_id: str, **values) -> None:
+    """Write job state in its own short transaction, visible to pollers."""
+    SessionLocal = create_session_factory()
+    with SessionLocal() as db:
+        db.execute(update(Job).where(Job.id == job_id).values(**values))
+        db.commit()
+
+
+def _run_import(job_id: str, target: Callable, path: str, file_name: str, kwargs):
+    _update_job(job_id, status="running", started_at=_now())
+
+    counts = _progress[job_id] = {"rows_processed": 0, "rows_failed": 0}
+
+    def progress(rows_processed: int, rows_failed: int) -> None:
+        counts.update(rows_processed=rows_processed, rows_failed=rows_failed)
+
+    SessionLocal = create_session_factory()
+    try:
+        with open(path, "rb") as file, SessionLocal() as db:
+            result = target(
+                file=file, file_name=file_name, db=db, progress=progress, **kwargs
+            )
+        _update_job(
+            job_id, status="succeeded", result=result, finished_at=_now(), **counts
+        )
+    except HTTPException as e:
+        _update_job(job_id, status="failed", error=str(e.detail), finished_at=_now())
+    except Exception as e:
+        logger.exception("Import job %s failed", job_id)
+        _update_job(job_id, status="failed", error=str(e), finished_at=_now())
+    finally:
+        _progress.pop(job_id, None)
+        os.remove(path)
+
+
+def live_progress(job_id: str) -> dict[str, int] | None:
+    """Counts so far of an import running in this process, else None."""
+    counts = _progress.get(job_id)
+    return dict(counts) if counts is not None else None
+
+
+async def _worker():
+    while True:
+        job = await _queue.get()
+        try:
+            await run_in_threadpool(_run_import, *job)
+        except Exception:
+            logger.exception("Import job %s could not be recorded", job[0])
+        finally:
+            _queue.task_done()
+
+
+def _interrupt(db: Session, *criteria) -> int:
+    result = db.execute(
+        update(Job)
+        .where(Job.status.in_(ACTIVE_STATUSES), *criteria)
+        .values(status="failed", error="Interrupted by a restart", finished_at=_now())
+    )
+    db.commit()
+    return result.rowcount
+
+
+def fail_interrupted_jobs(db: Session) -> int:
+    """
+    Jobs whose process stopped without finishing them will never finish.
+    Other worker processes keep heartbeating their own jobs, so only jobs
+    of a process that has been silent for `JOB_STALE_AFTER` are failed.
+    """
+    cutoff = _now() - timedelta(seconds=JOB_STALE_AFTER)
+    return _interrupt(
+        db,
+        Job.owner.is_distinct_from(OWNER),
+        (Job.heartbeat_at == None) | (Job.heartbeat_at < cutoff),  # noqa: E711
+    )
+
+
+def _heartbeat() -> None:
+    SessionLocal = create_session_factory()
+    with SessionLocal() as db:
+        now = _now()
+        db.execute(
+            update(Job)
+            .where(Job.owner == OWNER, Job.status.in_(ACTIVE_STATUSES))
+            .values(heartbeat_at=now)
+        )
+        # So a poll served by another worker process sees recent counts
+        for job_id, counts in list(_progress.items()):
+            db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "running")
+                .values(**counts)
+            )
+        db.commit()
+        fail_interrupted_jobs(db)
+
+
+async def _heartbeats():
+    while True:
+        await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+        try:
+            await run_in_threadpool(_heartbeat)
+        except Exception:
+            logger.warning("Could not record job heartbeats", exc_info=True)
+
+
+async def start(workers: int = JOB_WORKERS) -> None:
+    global _queue, _loop
+    _queue = asyncio.Queue()
+    _loop = asyncio.get_running_loop()
+    SessionLocal = create_session_factory()
+    with SessionLocal() as db:
+        fail_interrupted_jobs(db)
+    _workers.extend(asyncio.create_task(_worker()) for _ in range(workers))
+    _workers.append(asyncio.create_task(_heartbeats()))
+
+
+async def stop() -> None:
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    # Whatever is left in this process's queue is lost with it
+    SessionLocal = create_session_factory()
+    with SessionLocal() as db:
+        _interrupt(db, Job.owner == OWNER)
+
+
+def submit_import(
+    db: Session,
+    kind: str,
+    target: Callable,
+    upload: BinaryIO,
+    file_name: str,
+    user_id: str,
+    checklist_id: str,
+    **kwargs,
+) -> Job:
+    """
+    Record a queued job and hand it to the workers. The upload is copied to
+    a temp file first because the request's spooled file is closed once
+    the response is sent. Call from a threadpool (sync) route.
+    """
+    if _queue is None:
+        raise RuntimeError("Job runner not started")
+
+    suffix = os.path.splitext(file_name)[1]
+    fd, path = tempfile.mkstemp(prefix="import-", suffix=suffix)
+    with os.fdopen(fd, "wb") as copy:
+        upload.seek(0)
+        shutil.copyfileobj(upload, copy)
+
+    try:
+        job = Job(
+            kind=kind,
+            user_id=user_id,
+            checklist_id=checklist_id,
+            file_name=file_name,
+            owner=OWNER,
+            heartbeat_at=_now(),
+        )
+        db.add(job)
+        db.commit()
+    except Exception:
+        os.remove(path)
+        raise
+
+    item = (job.id, target, path, file_name, {"checklist_id": checklist_id, **kwargs})
+    _loop.call_soon_threadsafe(_queue.put_nowait, item)
+    return job
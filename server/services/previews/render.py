@@ -0,0 +1,25 @@
+# services/previews/render.py
+# Runs in the preview worker processes, so it only imports Pillow.
+
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+PREVIEW_FORMAT = "WEBP"
+PREVIEW_QUALITY = 80
+
+
+def render_preview(source_path: str, max_side: int) -> bytes:
+    """A WebP of the image at `source_path`, at most `max_side` pixels a side."""
+    with Image.open(source_path) as image:
+        # JPEGs decode straight at a reduced scale instead of full size
+        image.draft("RGB", (max_side, max_side))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_side, max_side))
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        output = BytesIO()
+        image.save(output, PREVIEW_FORMAT, quality=PREVIEW_QUALITY)
+        return output.getvalue()
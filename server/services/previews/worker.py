@@ -0,0 +1,100 @@
+# services/previews/worker.py
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import BinaryIO
+
+from services.previews.render import render_preview
+from services.storage.backends import storage_for_path
+
+logger = logging.getLogger("previews")
+
+PREVIEW_WORKERS = 2
+PREVIEW_MAX_SIDE = 480
+PREVIEW_SUFFIX = ".preview.webp"
+# Larger images are not worth decoding for a thumbnail
+PREVIEW_MAX_SOURCE_SIZE = 50 * 1024 * 1024
+PREVIEWABLE_TYPES = {
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/webp",
+    "image/bmp",
+    "image/tiff",
+}
+
+_pool: ProcessPoolExecutor | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+_tasks: set[asyncio.Task] = set()
+
+
+def preview_path(evidence_path: str) -> str:
+    """Where the preview of an evidence file is stored, beside it."""
+    return f"{evidence_path}{PREVIEW_SUFFIX}"
+
+
+async def _generate(source_path: str, evidence_path: str) -> None:
+    try:
+        data = await _loop.run_in_executor(
+            _pool, render_preview, source_path, PREVIEW_MAX_SIDE
+        )
+        storage = storage_for_path(evidence_path)
+        await storage.save_async(
+            BytesIO(data), storage.key(preview_path(evidence_path)), "image/webp"
+        )
+    except Exception:
+        logger.warning("No preview for %s", evidence_path, exc_info=True)
+    finally:
+        os.remove(source_path)
+
+
+def _start_task(source_path: str, evidence_path: str) -> None:
+    task = asyncio.create_task(_generate(source_path, evidence_path))
+    # Keep a reference until done, or the task can be garbage collected
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def schedule_preview(
+    file: BinaryIO, size: int, content_type: str, evidence_path: str
+) -> None:
+    """
+    Queue a preview of a newly stored image. The upload is copied to a temp
+    file first, as the request's file is closed once the response is sent.
+    Call from the threadpool; returns straight away.
+    """
+    if _pool is None or content_type not in PREVIEWABLE_TYPES:
+        return
+    if size > PREVIEW_MAX_SOURCE_SIZE:
+        return
+
+    fd, source_path = tempfile.mkstemp(prefix="preview-")
+    with os.fdopen(fd, "wb") as copy:
+        file.seek(0)
+        shutil.copyfileobj(file, copy)
+    file.seek(0)
+    _loop.call_soon_threadsafe(_start_task, source_path, evidence_path)
+
+
+def start(workers: int = PREVIEW_WORKERS) -> None:
+    global _pool, _loop
+    _loop = asyncio.get_running_loop()
+    # spawn: forking the multi-threaded server process can deadlock
+    _pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+async def stop() -> None:
+    global _pool
+    if _tasks:
+        await asyncio.gather(*_tasks, return_exceptions=True)
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
@@ -0,0 +1,39 @@
+# services/storage/backends.py
+
+from functools import lru_cache
+
+from services.storage.base import StorageBackend
+from services.storage.config import Config
+from services.storage.local import LocalStorage
+from services.storage.s3 import S3Storage
+
+
+@lru_cache
+def get_local_storage() -> LocalStorage:
+    return LocalStorage(Config.LOCAL_UPLOAD_DIR)
+
+
+@lru_cache
+def get_s3_storage() -> S3Storage:
+    return S3Storage(
+        bucket=Config.S3_BUCKET,
+        region=Config.S3_REGION,
+        endpoint_url=Config.S3_ENDPOINT_URL,
+        multipart_threshold=Config.S3_MULTIPART_THRESHOLD,
+        part_size=Config.S3_PART_SIZE,
+        max_concurrency=Config.S3_MAX_CONCURRENCY,
+    )
+
+
+def get_storage() -> StorageBackend:
+    """The backend new evidence files are written to."""
+    if Config.STORAGE_BACKEND == "local":
+        return get_local_storage()
+    return get_s3_storage()
+
+
+def storage_for_path(path: str) -> StorageBackend:
+    """The backend holding an existing evidence path, whatever is configured now."""
+    if path.startswith("s3://"):
+        return get_s3_storage()
+    return get_local_storage()
@@ -0,0 +1,66 @@
+# services/storage/base.py
+
+import mimetypes
+from abc import ABC, abstractmethod
+from typing import BinaryIO
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+
+def guess_content_type(file_name: str) -> str:
+    content_type, _ = mimetypes.guess_type(file_name)
+    return content_type or "application/octet-stream"
+
+
+class StorageBackend(ABC):
+    """
+    Where evidence files live. `save` returns the path stored on the
+    response (`evidence_path`); every other method takes that path.
+    Methods block, so async callers use the `*_async` variants, which run
+    them in the threadpool. Backends implement every abstract method;
+    `presigned_post` is optional.
+    """
+
+    @abstractmethod
+    def path(self, key: str) -> str:
+        """The evidence path `save` returns for `key`."""
+
+    @abstractmethod
+    def key(self, path: str) -> str:
+        """The key of an evidence path, the inverse of `path`."""
+
+    @abstractmethod
+    def save(self, file: BinaryIO, key: str, content_type: str) -> str:
+        """Store `file` under `key` and return its evidence path."""
+
+    @abstractmethod
+    def size(self, path: str) -> int | None:
+        """Size in bytes, or None when there is no such file."""
+
+    @abstractmethod
+    def download(self, path: str, dest: BinaryIO) -> None:
+        """Write the file's bytes to `dest`."""
+
+    @abstractmethod
+    def delete(self, path: str) -> None:
+        """Remove the file; a missing file is not an error."""
+
+    @abstractmethod
+    def url(self, path: str, expires_in: int = 3600) -> str:
+        """A URL the browser can open the file with."""
+
+    def presigned_post(
+        self, key: str, content_type: str, max_size: int, expires_in: int
+    ) -> dict:
+        """URL and form fields the browser can POST one file to `key` with."""
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Direct uploads are not supported by this storage backend",
+        )
+
+    async def save_async(self, file: BinaryIO, key: str, content_type: str) -> str:
+        return await run_in_threadpool(self.save, file, key, content_type)
+
+    async def delete_async(self, path: str) -> None:
+        await run_in_threadpool(self.delete, path)
@@ -0,0 +1,56 @@
+# services/storage/config.py
+
+import os
+from typing import Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+MB = 1024 * 1024
+
+
+class StorageConfig(BaseSettings):
+    # Where new evidence files go; existing paths are read from wherever
+    # they point (s3://... or a path under LOCAL_UPLOAD_DIR)
+    STORAGE_BACKEND: Literal["s3", "local"] = "s3"
+    LOCAL_UPLOAD_DIR: str = os.path.join(ROOT_DIR, "uploads")
+
+    S3_BUCKET: str = "infosec-securityassesment"
+    S3_REGION: str = "ap-south-1"
+    # Set to point the S3 backend at a local stand-in (MinIO, moto server)
+    S3_ENDPOINT_URL: str | None = None
+    # Files above the threshold are sent as multipart uploads, in parts of
+    # S3_PART_SIZE with up to S3_MAX_CONCURRENCY parts in flight
+    S3_MULTIPART_THRESHOLD: int = 8 * MB
+    S3_PART_SIZE: int = 8 * MB
+    S3_MAX_CONCURRENCY: int = 8
+
+    # Evidence view URLs are cached per file and user until this many
+    # seconds before they expire
+    SIGNED_URL_EXPIRES_IN: int = 3600
+    SIGNED_URL_CACHE_MARGIN: int = 300
+    SIGNED_URL_CACHE_SIZE: int = 50_000
+
+    # Browser uploads straight to the bucket through a presigned POST
+    DIRECT_UPLOAD_MAX_SIZE: int = 100 * MB
+    DIRECT_UPLOAD_EXPIRES_IN: int = 900
+    DIRECT_UPLOAD_CONTENT_TYPES: list[str] = [
+        "application/pdf",
+        "image/png",
+        "image/jpeg",
+        "image/gif",
+        "image/webp",
+        "text/plain",
+        "text/csv",
+        "application/json",
+        "application/zip",
+        "application/msword",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "application/vnd.ms-excel",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ]
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+
+Config = StorageConfig()
@@ -0,0 +1,69 @@
+# services/storage/local.py
+
+import os
+import shutil
+import tempfile
+from typing import BinaryIO
+
+from fastapi import HTTPException, status
+
+from services.storage.base import StorageBackend
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class LocalStorage(StorageBackend):
+    """Files under `root`, served by the /uploads static mount."""
+
+    def __init__(self, root: str, url_prefix: str = "/uploads"):
+        self.root = os.path.realpath(root)
+        self.url_prefix = url_prefix
+        os.makedirs(self.root, exist_ok=True)
+
+    def _resolve(self, path: str) -> str:
+        full_path = os.path.realpath(os.path.join(self.root, path))
+        if os.path.commonpath([self.root, full_path]) != self.root:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid file path {path}",
+            )
+        return full_path
+
+    def path(self, key: str) -> str:
+        return key
+
+    def key(self, path: str) -> str:
+        return path
+
+    def save(self, file: BinaryIO, key: str, content_type: str) -> str:
+        full_path = self._resolve(key)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        # Write next to the target and rename, so readers never see half a file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(full_path))
+        try:
+            with os.fdopen(fd, "wb") as dest:
+                shutil.copyfileobj(file, dest, COPY_CHUNK_SIZE)
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return self.path(key)
+
+    def size(self, path: str) -> int | None:
+        try:
+            return os.path.getsize(self._resolve(path))
+        except FileNotFoundError:
+            return None
+
+    def download(self, path: str, dest: BinaryIO) -> None:
+        with open(self._resolve(path), "rb") as source:
+            shutil.copyfileobj(source, dest, COPY_CHUNK_SIZE)
+
+    def delete(self, path: str) -> None:
+        try:
+            os.remove(self._resolve(path))
+        except FileNotFoundError:
+            pass
+
+    def url(self, path: str, expires_in: int = 3600) -> str:
+        return f"{self.url_prefix}/{path.lstrip('/')}"
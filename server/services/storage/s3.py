@@ -0,0 +1,164 @@
+# services/storage/s3.py
+
+import time
+from typing import BinaryIO
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from fastapi import HTTPException, status
+
+from services.extensions.metrics import S3_UPLOAD_DURATION
+from services.storage.base import StorageBackend
+
+
+class _KeepOpen:
+    """The caller's file, minus close(): boto3 closes single-part uploads."""
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def close(self):
+        pass
+
+
+class S3Storage(StorageBackend):
+    """Private objects in one bucket; paths are s3://<bucket>/<key>."""
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str,
+        endpoint_url: str | None = None,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 8,
+    ):
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            region_name=region,
+            endpoint_url=endpoint_url,
+            config=Config(
+                signature_version="s3v4",
+                # One connection per part in flight, or parts queue for the pool
+                max_pool_connections=max(10, max_concurrency),
+            ),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=part_size,
+            max_concurrency=max_concurrency,
+        )
+
+    def _split(self, path: str) -> tuple[str, str]:
+        """
+        Bucket and key of an s3:// path; a bare key is in our bucket. A
+        path in any other bucket is rejected, so nothing outside the
+        evidence bucket is ever signed, read or deleted.
+        """
+        if not path.startswith("s3://"):
+            return self.bucket, path
+        bucket, _, key = path[len("s3://") :].partition("/")
+        if bucket != self.bucket or not key:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid file path {path}",
+            )
+        return bucket, key
+
+    def path(self, key: str) -> str:
+        return f"s3://{self.bucket}/{key}"
+
+    def key(self, path: str) -> str:
+        return self._split(path)[1]
+
+    def save(self, file: BinaryIO, key: str, content_type: str) -> str:
+        started = time.perf_counter()
+        try:
+            # Reads the file part by part; parts upload concurrently
+            self.client.upload_fileobj(
+                _KeepOpen(file),
+                self.bucket,
+                key,
+                ExtraArgs={
+                    "ACL": "private",
+                    "ContentType": content_type,
+                    "ContentDisposition": "inline",
+                },
+                Config=self.transfer_config,
+            )
+        except (BotoCoreError, ClientError) as e:
+            S3_UPLOAD_DURATION.labels("error").observe(time.perf_counter() - started)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error uploading file to S3: {e}",
+            )
+        S3_UPLOAD_DURATION.labels("success").observe(time.perf_counter() - started)
+        return self.path(key)
+
+    def size(self, path: str) -> int | None:
+        bucket, key = self._split(path)
+        try:
+            return self.client.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise
+
+    def download(self, path: str, dest: BinaryIO) -> None:
+        bucket, key = self._split(path)
+        self.client.download_fileobj(bucket, key, dest, Config=self.transfer_config)
+
+    def delete(self, path: str) -> None:
+        bucket, key = self._split(path)
+        self.client.delete_object(Bucket=bucket, Key=key)
+
+    def url(self, path: str, expires_in: int = 3600) -> str:
+        bucket, key = self._split(path)
+        try:
+            return self.client.generate_presigned_url(
+                "get_object",
+                Params={
+                    "Bucket": bucket,
+                    "Key": key,
+                    "ResponseContentDisposition": "inline",
+                },
+                ExpiresIn=expires_in,
+            )
+        except ClientError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error generating S3 URL: {e}",
+            )
+
+    def presigned_post(
+        self, key: str, content_type: str, max_size: int, expires_in: int
+    ) -> dict:
+        # The policy pins the key, type and metadata and caps the size, so
+        # the form can't be reused for anything but this one file
+        fields = {
+            "acl": "private",
+            "Content-Type": content_type,
+            "Content-Disposition": "inline",
+        }
+        try:
+            return self.client.generate_presigned_post(
+                self.bucket,
+                key,
+                Fields=fields,
+                Conditions=[
+                    *({name: value} for name, value in fields.items()),
+                    ["content-length-range", 1, max_size],
+                ],
+                ExpiresIn=expires_in,
+            )
+        except ClientError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error generating S3 upload form: {e}",
+            )
@@ -0,0 +1,74 @@
+# services/storage/url_cache.py
+
+import threading
+import time
+from typing import Callable
+
+from services.storage.config import Config
+
+
+class SignedUrlCache:
+    """
+    Signed view URLs by (evidence path, user), reused until `margin`
+    seconds before they expire so a URL handed out from the cache is
+    still good for at least that long. Per process, thread-safe.
+    """
+
+    def __init__(self, margin: int, max_entries: int):
+        self.margin = margin
+        self.max_entries = max_entries
+        self._entries: dict[tuple[str, str], tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, user_id: str) -> tuple[str, float] | None:
+        """The cached URL and its expiry, if there is one still worth handing out."""
+        with self._lock:
+            hit = self._entries.get((path, user_id))
+        if hit and hit[1] - self.margin > time.time():
+            return hit
+        return None
+
+    def get_or_sign(
+        self,
+        path: str,
+        user_id: str,
+        expires_in: int,
+        sign: Callable[[str, int], str],
+    ) -> tuple[str, float]:
+        """URL for `path` and the epoch time it expires at."""
+        hit = self.get(path, user_id)
+        if hit:
+            return hit
+
+        now = time.time()
+        entry = (sign(path, expires_in), now + expires_in)
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._evict(now)
+            self._entries[(path, user_id)] = entry
+        return entry
+
+    def max_age(self, expires_at: float) -> int:
+        """Seconds a client may reuse a URL expiring at `expires_at`."""
+        return max(0, int(expires_at - self.margin - time.time()))
+
+    def _evict(self, now: float) -> None:
+        self._entries = {
+            key: entry
+            for key, entry in self._entries.items()
+            if entry[1] - self.margin > now
+        }
+        if len(self._entries) >= self.max_entries:
+            # Still full: drop the older half, in insertion order
+            keep = list(self._entries.items())[len(self._entries) // 2 :]
+            self._entries = dict(keep)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+signed_urls = SignedUrlCache(
+    margin=Config.SIGNED_URL_CACHE_MARGIN,
+    max_entries=Config.SIGNED_URL_CACHE_SIZE,
+)
@@ -0,0 +1,161 @@
+import os
+
+# db.config reads these at import time; the tests bring their own engine
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("POOL_SIZE", "5")
+os.environ.setdefault("MAX_OVERFLOW", "5")
+os.environ.setdefault("POOL_TIMEOUT", "30")
+os.environ.setdefault("POOL_RECYCLE", "1800")
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from db.base import Base
+from db.events import status_rollup  # noqa: F401  registers the status listeners
+from models import Application, Checklist, ChecklistAssignment, Control, User
+from models.schemas.crud_schemas import UserOut
+
+
+@compiles(MEDIUMTEXT, "sqlite")
+def _mediumtext_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+
+class StatementLog(list):
+    """SQL statements run on the engine, in order."""
+
+    @property
+    def commits(self) -> int:
+        return sum(1 for statement in self if statement == "COMMIT")
+
+    def queries(self) -> list[str]:
+        return [statement for statement in self if statement != "COMMIT"]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(engine, admin, monkeypatch):
+    """The app, lifespan included, on the test database and signed in as admin."""
+    from fastapi.testclient import TestClient
+
+    import main
+    from db.connection import Config as DBConfig
+    from services.auth.deps import get_current_user
+    from services.extensions.rate_limiter import limiter
+
+    monkeypatch.setattr(
+        DBConfig, "DATABASE_URL", engine.url.render_as_string(hide_password=False)
+    )
+    main.app.dependency_overrides[get_current_user] = lambda: admin
+    limiter.reset()
+    with TestClient(main.app) as client:
+        yield client
+    main.app.dependency_overrides.clear()
+    limiter.reset()
+
+
+@pytest.fixture
+def db(engine):
+    SessionLocal = sessionmaker(autoflush=False, autocommit=False, bind=engine)
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def statements(engine):
+    """Every statement and COMMIT on `engine`; clear it once seeding is done."""
+    log = StatementLog()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        log.append(statement)
+
+    def commit(conn):
+        log.append("COMMIT")
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "commit", commit)
+    yield log
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    event.remove(engine, "commit", commit)
+
+
+@pytest.fixture
+def make_user(db):
+    def make(username: str, role: str = "user") -> UserOut:
+        user = User(
+            username=username,
+            email=f"{username}@example.com",
+            password_hash="x",
+            first_name=username.title(),
+            role=role,
+        )
+        db.add(user)
+        db.commit()
+        return UserOut.model_validate(user)
+
+    return make
+
+
+@pytest.fixture
+def admin(make_user) -> UserOut:
+    return make_user("admin", role="admin")
+
+
+@pytest.fixture
+def make_app(db, admin):
+    names = (f"app {i}" for i in range(1000))
+
+    def make() -> Application:
+        application = Application(
+            name=next(names), creator_id=admin.id, owner_id=admin.id
+        )
+        db.add(application)
+        db.commit()
+        return application
+
+    return make
+
+
+@pytest.fixture
+def make_checklist(db, admin, make_app):
+    """Create a checklist of `controls` controls, in a new application by default."""
+
+    def make(
+        controls: int = 3,
+        assigned: list[UserOut] = (),
+        application: Application | None = None,
+    ) -> Checklist:
+        application = application or make_app()
+        checklist = Checklist(
+            app_id=application.id,
+            checklist_type="web",
+            creator_id=admin.id,
+            controls_count=controls,
+        )
+        db.add(checklist)
+        db.flush()
+        for user in assigned:
+            db.add(ChecklistAssignment(checklist_id=checklist.id, user_id=user.id))
+        for i in range(controls):
+            db.add(
+                Control(
+                    checklist_id=checklist.id,
+                    control_area=f"area {i}",
+                    severity="low",
+                    control_text=f"control {i}",
+                )
+            )
+        db.commit()
+        return checklist
+
+    return make
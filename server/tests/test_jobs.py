@@ -0,0 +1,79 @@
+import time
+from datetime import timedelta
+
+from models import Control
+from models.core.jobs import Job
+from services.jobs import runner
+
+
+def test_only_jobs_of_silent_processes_are_failed(db, admin):
+    now = runner._now()
+    jobs = {
+        "sibling": Job(owner="other:1:a", heartbeat_at=now),
+        "dead": Job(owner="other:2:b", heartbeat_at=now - timedelta(minutes=10)),
+        "legacy": Job(),
+        "own": Job(owner=runner.OWNER, heartbeat_at=now - timedelta(minutes=10)),
+    }
+    for job in jobs.values():
+        job.kind, job.user_id, job.status = "controls", admin.id, "running"
+    db.add_all(jobs.values())
+    db.commit()
+
+    assert runner.fail_interrupted_jobs(db) == 2
+
+    db.expire_all()
+    assert {name: job.status for name, job in jobs.items()} == {
+        "sibling": "running",
+        "dead": "failed",
+        "legacy": "failed",
+        "own": "running",
+    }
+
+
+def test_progress_is_visible_while_the_import_holds_its_transaction(
+    client, db, admin, make_checklist, tmp_path
+):
+    checklist = make_checklist(controls=1)
+    job = Job(kind="controls", user_id=admin.id, owner=runner.OWNER)
+    db.add(job)
+    db.commit()
+    upload = tmp_path / "upload.csv"
+    upload.write_text("control_area\n")
+    seen = []
+
+    def poll():
+        response = client.get(f"/jobs/{job.id}")
+        seen.append(response.json()["rows_processed"])
+
+    def target(file, file_name, db, progress, checklist_id):
+        # Like the real imports: one write transaction across every chunk
+        db.add(
+            Control(
+                checklist_id=checklist_id,
+                control_area="a",
+                severity="low",
+                control_text="c",
+            )
+        )
+        db.flush()
+        for rows in (2, 4):
+            progress(rows, 0)
+            poll()
+        db.commit()
+        return {"inserted": 4}
+
+    started = time.perf_counter()
+    runner._run_import(
+        job.id, target, str(upload), "upload.csv", {"checklist_id": checklist.id}
+    )
+
+    assert seen == [2, 4]
+    # No write waited out the SQLite busy timeout
+    assert time.perf_counter() - started < 2
+    db.expire_all()
+    assert (job.status, job.rows_processed, job.result) == (
+        "succeeded",
+        4,
+        {"inserted": 4},
+    )
+    assert runner.live_progress(job.id) is None
@@ -0,0 +1,59 @@
+import pytest
+
+from controllers.application_controller import list_apps
+from controllers.checklist_controller import get_checklists_for_app
+from models.schemas.params import AppQueryParams, ChecklistQueryParams
+
+
+@pytest.fixture
+def seed_apps(db, make_user, make_app, make_checklist):
+    """Apps with three checklists, each assigned to two users."""
+    users = [make_user("alice"), make_user("bob")]
+
+    def seed(count: int):
+        apps = [make_app() for _ in range(count)]
+        for application in apps:
+            for _ in range(3):
+                make_checklist(controls=1, assigned=users, application=application)
+        # Nothing the listing reads may come from the identity map
+        db.expunge_all()
+        return apps
+
+    return seed
+
+
+@pytest.mark.parametrize("count", [2, 10])
+def test_list_apps_statements_do_not_grow_with_the_page(
+    db, admin, seed_apps, statements, count
+):
+    seed_apps(count)
+    statements.clear()
+
+    result = list_apps(db, admin, AppQueryParams(search=None))
+
+    assert len(result["apps"]) == count
+    assert all(len(app.checklists[0].assigned_users) == 2 for app in result["apps"])
+    # Page with its total, checklists, assignments with users, two priorities
+    assert len(statements.queries()) == 5
+
+
+@pytest.mark.parametrize("count", [2, 10])
+def test_admin_checklist_list_statements_do_not_grow_with_the_page(
+    db, admin, make_user, make_app, make_checklist, statements, count
+):
+    users = [make_user("alice"), make_user("bob")]
+    application = make_app()
+    app_id = application.id
+    for _ in range(count):
+        make_checklist(controls=1, assigned=users, application=application)
+    db.expunge_all()
+    statements.clear()
+
+    result = get_checklists_for_app(
+        app_id, db, admin, ChecklistQueryParams(search=None, page=1, page_size=15)
+    )
+
+    assert len(result["checklists"]) == count
+    assert all(len(chk.assigned_users) == 2 for chk in result["checklists"])
+    # App, page with its total, assignments with users, priorities
+    assert len(statements.queries()) == 4
@@ -0,0 +1,53 @@
+import pytest
+
+import main
+
+TOKEN = "scrape-token"
+
+
+@pytest.fixture
+def scrape(client, monkeypatch):
+    monkeypatch.setattr(main.MetricsConfig, "METRICS_TOKEN", TOKEN)
+
+    def scrape() -> str:
+        response = client.get(
+            "/metrics", headers={"Authorization": f"Bearer {TOKEN}"}
+        )
+        assert response.status_code == 200
+        return response.text
+
+    return scrape
+
+
+def test_metrics_are_off_without_a_token(client):
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_need_the_token(scrape, client):
+    assert client.get("/metrics").status_code == 401
+    wrong = {"Authorization": "Bearer guess"}
+    assert client.get("/metrics", headers=wrong).status_code == 401
+
+
+def test_scrape_reports_requests_pools_and_rate_limits(scrape, client):
+    from services.extensions.rate_limiter import limiter
+
+    assert client.get("/applications", params={"search": "null"}).status_code == 200
+    # The default limit is 100/minute per client
+    statuses = {client.get("/health").status_code for _ in range(101)}
+    assert statuses == {200, 429}
+    limiter.reset()
+
+    text = scrape()
+
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/applications",status="200"}'
+    ) in text
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET"' in text
+    # The scrape itself is the request in flight
+    assert 'http_requests_in_flight{method="GET"} 1.0' in text
+    assert 'db_pool_size{engine="sync"} 5.0' in text
+    assert 'db_pool_checked_out{engine="sync"}' in text
+    assert 'db_pool_overflow{engine="async"}' in text
+    assert 'rate_limit_rejections_total{route="/health"}' in text
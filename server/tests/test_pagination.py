@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import select
+
+from controllers.controls_controller import get_controls_with_responses
+from models import Control, UserResponse
+from models.schemas.params import ControlsResponsesQueryParams
+
+
+def page_through(db, checklist_id, user, page_size):
+    rows, cursor = [], ""
+    while cursor is not None:
+        page = get_controls_with_responses(
+            checklist_id=checklist_id,
+            db=db,
+            current_user=user,
+            params=ControlsResponsesQueryParams(
+                page=1, page_size=page_size, cursor=cursor, include_total=False
+            ),
+        )
+        rows += [(row.control_id, row.response_id) for row in page.list_controls]
+        cursor = page.next_cursor
+    return rows
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 3])
+def test_controls_answered_by_several_users_page_without_gaps(
+    db, admin, make_user, make_checklist, page_size
+):
+    alice, bob = make_user("alice"), make_user("bob")
+    checklist = make_checklist(controls=3, assigned=[alice, bob])
+    controls = db.scalars(
+        select(Control).where(Control.checklist_id == checklist.id)
+    ).all()
+    # Two responses to one control, so some page edge falls between them
+    for user in (alice, bob):
+        db.add(
+            UserResponse(
+                control_id=controls[0].id,
+                checklist_id=checklist.id,
+                user_id=user.id,
+                current_setting="set",
+                review_comment="ok",
+            )
+        )
+    db.commit()
+
+    rows = page_through(db, checklist.id, admin, page_size)
+
+    assert len(rows) == len(set(rows)) == 4
+    assert {response_id for _, response_id in rows} >= {
+        response.id
+        for response in db.scalars(select(UserResponse)).all()
+    }
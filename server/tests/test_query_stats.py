@@ -0,0 +1,104 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from db.connection import get_engine
+
+SERVER_TIMING = re.compile(r'db;dur=(?P<ms>[\d.]+);desc="(?P<count>\d+) queries"')
+HOLD = 0.3  # seconds the slow request's statement is held back
+
+
+def db_timing(response) -> tuple[int, float]:
+    """The request's (queries, DB milliseconds), checking both headers agree."""
+    count = int(response.headers["X-DB-Queries"])
+    timing = SERVER_TIMING.search(response.headers["Server-Timing"])
+    assert timing and int(timing["count"]) == count
+    return count, float(timing["ms"])
+
+
+@contextmanager
+def on_statement(fn, **kw):
+    """Run `fn` before every statement the app's engine sends."""
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", fn, **kw)
+    try:
+        yield
+    finally:
+        event.remove(engine, "before_cursor_execute", fn)
+
+
+def test_headers_count_the_requests_own_statements(client, make_app):
+    app_id = make_app().id
+    sent = []
+
+    with on_statement(lambda conn, cursor, statement, *args: sent.append(statement)):
+        response = client.get(f"/applications/{app_id}")
+
+    assert response.status_code == 200
+    count, ms = db_timing(response)
+    assert count == len(sent) > 0
+    assert ms > 0
+    assert db_timing(client.get("/health")) == (0, 0.0)
+
+
+def test_concurrent_requests_keep_their_own_timings(client, make_app, make_checklist):
+    slow_id = make_checklist(controls=1).app_id
+    app_id = make_app().id
+    solo, _ = db_timing(client.get(f"/applications/{app_id}"))
+    held, released = threading.Event(), threading.Event()
+
+    def hold_slow_app(conn, cursor, statement, parameters, *args):
+        # Hold the export's first statement until the other requests are done
+        if slow_id in str(parameters) and not held.is_set():
+            held.set()
+            released.wait(timeout=5)
+            time.sleep(HOLD)
+
+    with on_statement(hold_slow_app), ThreadPoolExecutor(6) as pool:
+        slow = pool.submit(client.get, f"/applications/{slow_id}/export")
+        assert held.wait(timeout=5)
+        fast = [
+            pool.submit(client.get, f"/applications/{app_id}") for _ in range(5)
+        ]
+        fast = [future.result() for future in fast]
+        released.set()
+        slow = slow.result()
+
+    assert slow.status_code == 200
+    assert db_timing(slow)[1] >= HOLD * 1000
+    for response in fast:
+        assert response.status_code == 200
+        count, ms = db_timing(response)
+        assert count == solo
+        assert ms < HOLD * 1000
+
+
+def test_nothing_carries_over_from_a_failed_request(client, make_app):
+    app_id = make_app().id
+    solo = db_timing(client.get(f"/applications/{app_id}"))[0]
+
+    def break_statement(conn, cursor, statement, parameters, context, many):
+        # Reaches the cursor and fails there, after the start time was taken
+        return "SELECT * FROM no_such_table", parameters
+
+    with on_statement(break_statement, retval=True):
+        failed = client.get(f"/applications/{app_id}")
+    missing = client.get("/applications/no-such-app")
+
+    # The statement that failed isn't counted and its clock didn't leak
+    assert failed.status_code == 500
+    assert db_timing(failed) == (0, 0.0)
+    assert missing.status_code == 404
+    assert db_timing(missing)[0] > 0
+    assert db_timing(client.get("/health")) == (0, 0.0)
+    # A start time left behind would land on whichever request next used
+    # that pooled connection; go round the whole pool after a pause
+    time.sleep(HOLD)
+    for _ in range(get_engine().pool.size() + 1):
+        count, ms = db_timing(client.get(f"/applications/{app_id}"))
+        assert count == solo
+        assert ms < HOLD * 1000
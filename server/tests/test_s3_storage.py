@@ -0,0 +1,107 @@
+import io
+from urllib.parse import urlparse
+
+import boto3
+import pytest
+from fastapi import HTTPException
+from moto import mock_aws
+
+from controllers.user_responses_controller import check_evidence_access
+from models import Control, UserResponse
+from services.storage.s3 import S3Storage
+
+BUCKET = "evidence-bucket"
+PART_SIZE = 5 * 1024 * 1024  # S3's smallest multipart part
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    for name, value in {
+        "AWS_ACCESS_KEY_ID": "testing",
+        "AWS_SECRET_ACCESS_KEY": "testing",
+        "AWS_DEFAULT_REGION": "us-east-1",
+    }.items():
+        monkeypatch.setenv(name, value)
+    with mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        yield S3Storage(
+            bucket=BUCKET,
+            region="us-east-1",
+            multipart_threshold=PART_SIZE,
+            part_size=PART_SIZE,
+        )
+
+
+def test_save_and_download_a_small_file(storage):
+    file = io.BytesIO(b"evidence")
+
+    path = storage.save(file, "user_uploads/u/c/a.txt", "text/plain")
+    dest = io.BytesIO()
+    storage.download(path, dest)
+
+    assert path == f"s3://{BUCKET}/user_uploads/u/c/a.txt"
+    assert dest.getvalue() == b"evidence"
+    assert storage.size(path) == 8
+    # The caller hashes and previews the same file after the upload
+    assert not file.closed
+
+
+def test_large_file_is_uploaded_in_parts(storage):
+    data = b"x" * (2 * PART_SIZE + 1024)
+
+    path = storage.save(io.BytesIO(data), "evidence/big.bin", "application/pdf")
+
+    head = storage.client.head_object(Bucket=BUCKET, Key="evidence/big.bin")
+    assert head["ETag"].strip('"').endswith("-3")
+    assert storage.size(path) == len(data)
+
+
+def test_url_signs_a_get_for_the_evidence_bucket(storage):
+    path = storage.save(io.BytesIO(b"x"), "evidence/a.png", "image/png")
+
+    url = urlparse(storage.url(path, expires_in=60))
+
+    assert BUCKET in url.netloc + url.path
+    assert url.path.endswith("/evidence/a.png")
+    assert "X-Amz-Signature=" in url.query
+
+
+@pytest.mark.parametrize(
+    "path", ["s3://some-other-bucket/payroll/secret.pdf", f"s3://{BUCKET}", "s3://"]
+)
+def test_paths_outside_the_evidence_bucket_are_rejected(storage, path):
+    for call in (storage.url, storage.size, storage.delete):
+        with pytest.raises(HTTPException) as error:
+            call(path)
+        assert error.value.status_code == 400
+
+
+def test_evidence_is_only_signed_for_users_who_may_see_it(
+    db, admin, make_user, make_checklist
+):
+    alice, bob, mallory = make_user("alice"), make_user("bob"), make_user("mallory")
+    checklist = make_checklist(controls=1, assigned=[alice, bob])
+    control = db.query(Control).filter_by(checklist_id=checklist.id).one()
+    path = f"s3://{BUCKET}/user_uploads/{alice.id}/{control.id}/a.pdf"
+    db.add(
+        UserResponse(
+            control_id=control.id,
+            checklist_id=checklist.id,
+            user_id=alice.id,
+            current_setting="set",
+            review_comment="ok",
+            evidence_path=path,
+        )
+    )
+    db.commit()
+
+    for user in (alice, bob, admin):
+        check_evidence_access(path, db, user)
+    for user, other_path in (
+        (mallory, path),
+        (admin, "s3://some-other-bucket/payroll/secret.pdf"),
+        (alice, f"s3://{BUCKET}/user_uploads/{bob.id}/other.pdf"),
+    ):
+        with pytest.raises(HTTPException) as error:
+            check_evidence_access(other_path, db, user)
+        assert error.value.status_code == 404
@@ -0,0 +1,81 @@
+from sqlalchemy import select
+
+from controllers.application_controller import create_app, update_app
+from controllers.checklist_controller import (
+    create_checklist,
+    update_checklist,
+    update_checklist_status,
+)
+from controllers.user_responses_controller import (
+    add_user_response,
+    update_user_response,
+)
+from models import Control, UserResponse
+from models.schemas.crud_schemas import (
+    ApplicationCreate,
+    ApplicationUpdate,
+    ChecklistCreate,
+    ChecklistUpdate,
+    UserResponseCreate,
+    UserResponseUpdate,
+)
+
+
+def test_application_writes_commit_once(db, admin, statements):
+    app = create_app(ApplicationCreate(name="portal"), db, admin, admin)
+    assert statements.commits == 1
+
+    statements.clear()
+    update_app(ApplicationUpdate(description="x", priority=1), app.id, db, admin)
+    assert statements.commits == 1
+
+
+def test_checklist_writes_commit_once(db, admin, make_app, statements):
+    application = make_app()
+    statements.clear()
+
+    checklist = create_checklist(
+        ChecklistCreate(checklist_type="web"), application.id, db, admin
+    )
+    assert statements.commits == 1
+
+    statements.clear()
+    update_checklist(
+        ChecklistUpdate(checklist_type="api", priority=1), checklist.id, db, admin
+    )
+    assert statements.commits == 1
+
+    statements.clear()
+    update_checklist_status(checklist.id, db, checklist_status="approved")
+    assert statements.commits == 1
+
+
+def test_response_writes_commit_once_with_the_rollup(
+    db, make_user, make_checklist, statements
+):
+    alice = make_user("alice")
+    checklist = make_checklist(controls=2, assigned=[alice])
+    control = db.scalars(
+        select(Control).where(Control.checklist_id == checklist.id)
+    ).first()
+    statements.clear()
+
+    add_user_response(
+        UserResponseCreate(current_setting="set", review_comment="ok"),
+        control_id=control.id,
+        db=db,
+        current_user=alice,
+    )
+    assert statements.commits == 1
+    db.refresh(checklist)
+    assert checklist.status == "in-progress"
+
+    response_id = db.scalar(select(UserResponse.id))
+    statements.clear()
+    update_user_response(
+        UserResponseUpdate(review_comment="checked"),
+        response_id=response_id,
+        db=db,
+        current_user=alice,
+    )
+    assert statements.commits == 1
@@ -0,0 +1,95 @@
+from sqlalchemy import insert, select
+
+from controllers.checklist_controller import (
+    repair_checklist_counts,
+    update_checklist_status,
+)
+from controllers.user_responses_controller import add_user_response
+from db.events.status_rollup import recompute_all
+from models import Control, UserResponse
+from models.schemas.crud_schemas import UserResponseCreate
+
+
+def answer(db, checklist, user, start, stop):
+    controls = db.scalars(
+        select(Control).where(Control.checklist_id == checklist.id)
+    ).all()
+    for control in controls[start:stop]:
+        add_user_response(
+            UserResponseCreate(current_setting="set", review_comment="ok"),
+            control_id=control.id,
+            db=db,
+            current_user=user,
+        )
+
+
+def test_saving_a_response_keeps_an_admin_evaluation(db, make_user, make_checklist):
+    alice = make_user("alice")
+    checklist = make_checklist(controls=3, assigned=[alice])
+    answer(db, checklist, alice, 0, 1)
+    update_checklist_status(checklist.id, db, checklist_status="approved")
+
+    answer(db, checklist, alice, 1, 3)
+    db.refresh(checklist)
+    assert checklist.status == "approved"
+
+    recompute_all(db)
+    db.refresh(checklist)
+    assert checklist.status == "approved"
+
+
+def test_automatic_status_update_replaces_an_evaluation(
+    db, make_user, make_checklist
+):
+    alice = make_user("alice")
+    checklist = make_checklist(controls=3, assigned=[alice])
+    answer(db, checklist, alice, 0, 1)
+    update_checklist_status(checklist.id, db, checklist_status="rejected")
+
+    result = update_checklist_status(checklist.id, db)
+
+    assert result["status"] == "in-progress"
+    assert checklist.app.status == "in-progress"
+
+
+def test_recount_leaves_statuses_a_fresh_rollup_agrees_with(
+    db, admin, make_app, make_checklist
+):
+    application = make_app()
+    done = make_checklist(controls=2, application=application)
+    started = make_checklist(controls=2, application=application)
+    approved = make_checklist(controls=2)
+    update_checklist_status(approved.id, db, checklist_status="approved")
+    # A bulk load that bypasses the counters, and so the rollup
+    for checklist, answered in ((done, 2), (started, 1), (approved, 2)):
+        controls = db.scalars(
+            select(Control.id).where(Control.checklist_id == checklist.id)
+        ).all()
+        db.execute(
+            insert(UserResponse),
+            [
+                {
+                    "control_id": control_id,
+                    "checklist_id": checklist.id,
+                    "user_id": admin.id,
+                    "current_setting": "set",
+                    "review_comment": "ok",
+                }
+                for control_id in controls[:answered]
+            ],
+        )
+    db.commit()
+
+    assert repair_checklist_counts(db) == 3
+
+    db.expire_all()
+    assert [c.status for c in (done, started, approved)] == [
+        "completed",
+        "in-progress",
+        "approved",
+    ]
+    assert application.status == "in-progress"
+    report = recompute_all(db)
+    assert report["counters_repaired"] == 0
+    assert report["checklists_changed"] == 0
+    assert report["applications_changed"] == 0
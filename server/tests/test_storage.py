@@ -0,0 +1,33 @@
+import io
+
+import pytest
+
+from services.storage.base import StorageBackend
+from services.storage.local import LocalStorage
+from services.storage.s3 import S3Storage
+
+
+def test_a_backend_missing_a_method_cannot_be_created():
+    class NoDelete(StorageBackend):
+        path = key = save = size = download = url = lambda self, *args: None
+
+    with pytest.raises(TypeError, match="delete"):
+        NoDelete()
+
+
+@pytest.mark.parametrize("backend", [LocalStorage, S3Storage])
+def test_backends_implement_the_interface(backend):
+    assert not backend.__abstractmethods__
+
+
+def test_local_storage_round_trip(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+
+    path = storage.save(io.BytesIO(b"evidence"), "a/b.txt", "text/plain")
+    dest = io.BytesIO()
+    storage.download(path, dest)
+
+    assert dest.getvalue() == b"evidence"
+    assert storage.key(storage.path("a/b.txt")) == "a/b.txt"
+    storage.delete(path)
+    assert storage.size(path) is None